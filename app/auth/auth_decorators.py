@@ -1,16 +1,26 @@
 import json
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from config import Config
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.database.models import User
+from app.auth.identity_cache import get_active_user
+from app.auth.permission_cache import (get_authz_version,
+                                       permissions_from_claim,
+                                       get_effective_permissions)
 from app.utils import response
 
 def get_current_user():
+    """
+    Read-only snapshot of the signed-in user, or None when the account is
+    missing, deleted or unverified.
+    """
+    return get_active_user(get_current_user_id())
+
+
+def get_current_user_id():
     user_data = json.loads(get_jwt_identity())
-    user_id = user_data.get('user_id')
-    if not user_id:
-        return None
-    return User.query.get(user_id)
+    return user_data.get('user_id')
 
 
 def permission_required(permission_name):
@@ -18,16 +28,27 @@ def permission_required(permission_name):
         @wraps(fn)
         @jwt_required()                     
         def wrapper(*args, **kwargs):
-            user = get_current_user()
-            print(user, "user")
-            if not user:
+            user_id = get_current_user_id()
+            if not user_id:
+                return jsonify(response(False, "Unauthorized")), 401
+
+            claim = get_jwt().get("authz") if Config.JWT_EMBED_AUTHZ_CLAIMS else None
+            if claim is not None:
+                # roles changed since the token was issued
+                if claim.get("v") != get_authz_version(user_id):
+                    return jsonify(response(False, "Token permissions are outdated, please sign in again")), 401
+                effective = permissions_from_claim(claim)
+            else:
+                effective = get_effective_permissions(user_id)
+
+            if not effective:
                 return jsonify(response(False, "Unauthorized")), 401
 
             # admins always pass
-            if user.has_role('admin'):
+            if effective.is_admin:
                 return fn(*args, **kwargs)
 
-            if not user.has_permission(permission_name):
+            if permission_name not in effective.permissions:
                 return jsonify(response(False, "missing permission")), 403
 
             return fn(*args, **kwargs)
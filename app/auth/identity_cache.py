@@ -0,0 +1,81 @@
+from collections import namedtuple
+from flask import g, has_request_context
+from config import Config
+from extentions import db
+from app.cache import TTLCache
+from app.database.models import User
+
+
+# the columns routes read from the signed-in user; never the password
+SNAPSHOT_COLUMNS = (
+    "user_id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "is_verified",
+    "is_deleted",
+    "country",
+    "profile_image",
+    "created_at",
+    "updated_at",
+)
+
+UserSnapshot = namedtuple("UserSnapshot", SNAPSHOT_COLUMNS)
+
+# user_id -> UserSnapshot of a verified, not deleted user
+identity_cache = TTLCache(maxsize=Config.IDENTITY_CACHE_SIZE, ttl=Config.IDENTITY_CACHE_TTL)
+
+
+def load_active_user(user_id):
+    """
+    Snapshot of a verified, not deleted user straight from the database.
+    """
+    row = db.session.execute(
+        db.select(*(getattr(User, column) for column in SNAPSHOT_COLUMNS))
+        .where(User.user_id == user_id, User.is_verified.is_(True), User.is_deleted.is_(False))
+    ).first()
+    return UserSnapshot(*row) if row is not None else None
+
+
+def _request_memo():
+    if not has_request_context():
+        return None
+    if "identity_snapshots" not in g:
+        g.identity_snapshots = {}
+    return g.identity_snapshots
+
+
+def get_active_user(user_id):
+    """
+    Read-only snapshot of an active user, or None. Looked up once per
+    request and shared across requests for IDENTITY_CACHE_TTL seconds.
+    Load the User model instead when the row is going to be modified.
+    """
+    if not user_id:
+        return None
+    key = str(user_id)
+    memo = _request_memo()
+    if memo is not None and key in memo:
+        return memo[key]
+
+    snapshot = identity_cache.get_or_set(key, lambda: load_active_user(user_id))
+    if memo is not None:
+        memo[key] = snapshot
+    return snapshot
+
+
+def invalidate_identity(user_id=None):
+    """
+    Drop the snapshot of one user, or of every user when no id is given.
+    Call after the change has been committed.
+    """
+    memo = _request_memo()
+    if user_id is None:
+        identity_cache.clear()
+        if memo is not None:
+            memo.clear()
+    else:
+        identity_cache.pop(str(user_id))
+        if memo is not None:
+            memo.pop(str(user_id), None)
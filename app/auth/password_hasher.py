@@ -0,0 +1,77 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingQueueFull(RuntimeError):
+    """
+    Raised when no hashing slot frees up within the configured timeout.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification in a process pool so the
+    CPU-bound work does not hold a request thread or the GIL.
+    At most `queue_size` jobs may be queued or running at once.
+    """
+
+    def __init__(self, method, workers, queue_size, timeout):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(queue_size, 1))
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+
+    def _executor(self):
+        if self.workers <= 0:
+            return None
+
+        # a pool inherited through fork() is unusable in the child
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _run(self, fn, *args):
+        executor = self._executor()
+        if executor is None:
+            return fn(*args)
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HashingQueueFull("Password hashing queue is full")
+        try:
+            return executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """
+        True when the stored hash was made with a different algorithm or cost.
+        """
+        return pwhash.split("$", 1)[0] != self.method
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+password_hasher = PasswordHasher(
+    method=Config.PASSWORD_HASH_METHOD,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    queue_size=Config.PASSWORD_HASH_QUEUE_SIZE,
+    timeout=Config.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
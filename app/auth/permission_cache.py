@@ -0,0 +1,112 @@
+from collections import namedtuple
+from config import Config
+from extentions import db
+from app.cache import TTLCache
+from app.database.models import User, Role, Permission, user_roles, role_permissions
+
+
+EffectivePermissions = namedtuple("EffectivePermissions", ["roles", "permissions", "is_admin"])
+
+permission_cache = TTLCache(maxsize=Config.PERMISSION_CACHE_SIZE, ttl=Config.PERMISSION_CACHE_TTL)
+
+# user_id -> authz_version, used to revoke tokens carrying embedded claims
+authz_versions = TTLCache(maxsize=Config.PERMISSION_CACHE_SIZE, ttl=Config.AUTHZ_VERSION_CACHE_TTL)
+
+
+def load_effective_permissions(user_id):
+    """
+    Resolve a user's role and permission names with a single query.
+    Returns None when the user does not exist.
+    """
+    rows = (
+        db.session.query(Role.name, Permission.name)
+        .select_from(User)
+        .outerjoin(user_roles, user_roles.c.user_id == User.user_id)
+        .outerjoin(Role, Role.role_id == user_roles.c.role_id)
+        .outerjoin(role_permissions, role_permissions.c.role_id == Role.role_id)
+        .outerjoin(Permission, Permission.permission_id == role_permissions.c.permission_id)
+        .filter(User.user_id == user_id)
+        .all()
+    )
+    if not rows:
+        return None
+
+    roles = frozenset(role for role, _ in rows if role)
+    permissions = frozenset(permission for _, permission in rows if permission)
+    return EffectivePermissions(roles, permissions, "admin" in roles)
+
+
+def get_effective_permissions(user_id):
+    """
+    Return the cached EffectivePermissions of a user, loading them on a miss.
+    """
+    return permission_cache.get_or_set(str(user_id), lambda: load_effective_permissions(user_id))
+
+
+def load_authz_version(user_id):
+    return db.session.query(User.authz_version).filter(User.user_id == user_id).scalar()
+
+
+def get_authz_version(user_id):
+    """
+    Return the current authz_version of a user from the in-memory map,
+    reading only that column on a miss. Returns None for unknown users.
+    """
+    return authz_versions.get_or_set(str(user_id), lambda: load_authz_version(user_id))
+
+
+def bump_authz_version(user_ids=None, role_id=None):
+    """
+    Increment authz_version for the given users and/or every holder of a role.
+    Runs in the caller's transaction; call invalidate_permissions after commit.
+    """
+    targets = []
+    if user_ids:
+        targets.append(User.user_id.in_(list(user_ids)))
+    if role_id is not None:
+        targets.append(User.user_id.in_(
+            db.select(user_roles.c.user_id).where(user_roles.c.role_id == role_id)
+        ))
+    if not targets:
+        return
+
+    User.query.filter(db.or_(*targets)).update(
+        {User.authz_version: User.authz_version + 1},
+        synchronize_session=False
+    )
+
+
+def build_authz_claim(user_id):
+    """
+    Compact roles/permissions claim embedded in access tokens.
+    """
+    effective = load_effective_permissions(user_id)
+    if effective is None:
+        return None
+
+    # always read the version fresh so a new token is never born stale
+    version = load_authz_version(user_id)
+    authz_versions.set(str(user_id), version)
+    return {
+        "r": sorted(effective.roles),
+        "p": sorted(effective.permissions),
+        "v": version,
+    }
+
+
+def permissions_from_claim(claim):
+    roles = frozenset(claim.get("r", ()))
+    return EffectivePermissions(roles, frozenset(claim.get("p", ())), "admin" in roles)
+
+
+def invalidate_permissions(user_id=None):
+    """
+    Drop the cached permissions and authz version of one user,
+    or of every user when no id is given.
+    """
+    if user_id is None:
+        permission_cache.clear()
+        authz_versions.clear()
+    else:
+        permission_cache.pop(str(user_id))
+        authz_versions.pop(str(user_id))
@@ -0,0 +1,108 @@
+import time
+import uuid
+import threading
+from collections import namedtuple
+from sqlalchemy.exc import SQLAlchemyError
+from extentions import db
+from app.database.models import RecipeCategories, CacheVersion
+
+
+Category = namedtuple("Category", ["category_id", "category_name", "created_at", "updated_at"])
+
+
+class CategoryRegistry:
+    """
+    In-process copy of recipe_categories. The cache_versions row is checked
+    at most every CATEGORY_REGISTRY_CHECK_INTERVAL seconds, and the table is
+    reloaded only when another node (or this one) bumped it.
+    """
+
+    def __init__(self, app=None):
+        self._categories = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.check_interval = 5.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.check_interval = app.config.get("CATEGORY_REGISTRY_CHECK_INTERVAL", 5.0)
+        if not app.config.get("CATEGORY_REGISTRY_PRELOAD", True):
+            return
+        with app.app_context():
+            try:
+                self.reload()
+            except SQLAlchemyError as e:
+                # e.g. `flask db upgrade` before the table exists; load lazily
+                app.logger.warning(f"[CATEGORIES] Preload skipped: {getattr(e, 'orig', e)}")
+            finally:
+                db.session.remove()
+
+    def _load_version(self):
+        return db.session.execute(
+            db.select(CacheVersion.version).where(CacheVersion.name == CacheVersion.RECIPE_CATEGORIES)
+        ).scalar() or 0
+
+    def reload(self):
+        """
+        Load the version first, so a write racing the reload is seen on the
+        next check instead of being masked.
+        """
+        version = self._load_version()
+        rows = db.session.execute(db.select(
+            RecipeCategories.category_id,
+            RecipeCategories.category_name,
+            RecipeCategories.created_at,
+            RecipeCategories.updated_at,
+        )).all()
+        with self._lock:
+            self._categories = {row.category_id: Category(*row) for row in rows}
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            # another thread may have just checked
+            if self._version is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return
+            self._checked_at = time.monotonic()
+        if self._load_version() != self._version:
+            self.reload()
+
+    def exists(self, category_id):
+        self._ensure_fresh()
+        if not isinstance(category_id, uuid.UUID):
+            try:
+                category_id = uuid.UUID(str(category_id))
+            except ValueError:
+                return False
+        return category_id in self._categories
+
+    def get(self, category_id):
+        self._ensure_fresh()
+        return self._categories.get(category_id)
+
+    def all(self):
+        """
+        Every category, ordered by name.
+        """
+        self._ensure_fresh()
+        return sorted(self._categories.values(), key=lambda category: category.category_name)
+
+    def bump_version(self):
+        """
+        Mark the categories as changed. Runs in the caller's transaction;
+        call reload() after commit.
+        """
+        updated = CacheVersion.query.filter_by(name=CacheVersion.RECIPE_CATEGORIES).update(
+            {CacheVersion.version: CacheVersion.version + 1},
+            synchronize_session=False
+        )
+        if not updated:
+            db.session.add(CacheVersion(name=CacheVersion.RECIPE_CATEGORIES, version=1))
+
+
+category_registry = CategoryRegistry()
@@ -0,0 +1,170 @@
+import gzip
+import zlib
+import hashlib
+from flask import request, current_app, Response
+
+try:
+    import brotli
+except ImportError:  # optional, see Readme
+    brotli = None
+
+
+DEFAULT_MIMETYPES = (
+    "application/json",
+    "application/javascript",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "image/svg+xml",
+)
+
+
+# uncompressed bytes after which a streamed body is flushed to the client
+STREAM_FLUSH_SIZE = 64 * 1024
+
+
+def _gzip_compressor(level):
+    # wbits=31 writes a gzip header and trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _brotli_compressor(quality):
+    compressor = brotli.Compressor(quality=quality)
+    return compressor.process, compressor.flush, compressor.finish
+
+
+def negotiate_encoding(accept_encodings):
+    """
+    Best encoding the client accepts: br when brotli is installed, then gzip.
+    """
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_stream(iterable, compressor, flush_size=STREAM_FLUSH_SIZE, charset="utf-8"):
+    """
+    Compress a streamed body chunk by chunk without buffering it; output is
+    flushed at least every `flush_size` input bytes. The wrapped iterable
+    is closed when the response is.
+    """
+    compress, flush, finish = compressor
+    pending = 0
+    try:
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            data = compress(chunk)
+            pending += len(chunk)
+            if pending >= flush_size:
+                data += flush()
+                pending = 0
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(iterable, "close", None)
+        if close is not None:
+            close()
+
+
+class ResponseCompression:
+    """
+    gzip/brotli compression of 2xx responses whose mimetype is in
+    COMPRESS_MIMETYPES (DEFAULT_MIMETYPES unless set) and whose body is at
+    least COMPRESS_MIN_SIZE bytes.
+    Streamed responses are compressed as they are sent.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get("COMPRESS_ENABLED", True):
+            return
+        app.after_request(self._compress)
+
+    def _compressor(self, encoding):
+        config = current_app.config
+        if encoding == "br":
+            return _brotli_compressor(config.get("COMPRESS_BR_LEVEL", 4))
+        return _gzip_compressor(config.get("COMPRESS_LEVEL", 6))
+
+    def _should_compress(self, response):
+        config = current_app.config
+        # errors, redirects, 204 and 304 are sent as they are
+        if request.method == "HEAD" or not 200 <= response.status_code < 300 or response.status_code in (204, 206):
+            return False
+        if response.direct_passthrough or "Content-Encoding" in response.headers:
+            return False
+        if response.mimetype not in (config.get("COMPRESS_MIMETYPES") or DEFAULT_MIMETYPES):
+            return False
+        if not response.is_streamed and response.content_length is not None:
+            return response.content_length >= config.get("COMPRESS_MIN_SIZE", 500)
+        return True
+
+    def _compress(self, response):
+        if not self._should_compress(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = negotiate_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        compressor = self._compressor(encoding)
+        if response.is_streamed:
+            response.response = compress_stream(response.response, compressor)
+            response.headers.pop("Content-Length", None)
+        else:
+            compress, _, finish = compressor
+            response.set_data(compress(response.get_data()) + finish())
+
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # the compressed body is no longer byte-identical to the tag
+            response.set_etag(etag, weak=True)
+        return response
+
+
+class PrecompressedFile:
+    """
+    A static file read and compressed once at startup and served from
+    memory with long-lived cache headers.
+    """
+
+    def __init__(self, path, mimetype, max_age=86400):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.mimetype = mimetype
+        self.max_age = max_age
+        self.etag = hashlib.sha1(self.data).hexdigest()
+        self.variants = {"gzip": gzip.compress(self.data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(self.data, quality=11)
+
+    def response(self):
+        encoding = negotiate_encoding(request.accept_encodings)
+        body = self.variants.get(encoding, self.data)
+        response = Response(body, mimetype=self.mimetype)
+        if body is not self.data:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        response.set_etag(f"{self.etag}-{encoding}" if body is not self.data else self.etag)
+        return response.make_conditional(request)
+
+
+def serve_precompressed(app, rule, path, mimetype, endpoint):
+    """
+    Register `rule` to serve `path` through a PrecompressedFile.
+    """
+    static_file = PrecompressedFile(path, mimetype, app.config.get("STATIC_CACHE_MAX_AGE", 86400))
+    app.add_url_rule(rule, endpoint, static_file.response)
+    return static_file
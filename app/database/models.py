@@ -1,7 +1,7 @@
 from extentions import db
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.auth.password_hasher import password_hasher
 import string
 import random
 from datetime import timedelta, datetime
@@ -9,13 +9,15 @@ from datetime import timedelta, datetime
 # Association table for user roles
 user_roles = db.Table('user_roles',
     db.Column('user_id', UUID(as_uuid=True), db.ForeignKey('user.user_id'), primary_key=True),
-    db.Column('role_id', UUID(as_uuid=True), db.ForeignKey('roles.role_id'), primary_key=True)
+    db.Column('role_id', UUID(as_uuid=True), db.ForeignKey('roles.role_id'), primary_key=True),
+    db.Index('ix_user_roles_role_id', 'role_id')
 )
 
 # Association table for role permissions
 role_permissions = db.Table('role_permissions',
     db.Column('role_id', UUID(as_uuid=True), db.ForeignKey('roles.role_id'), primary_key=True),
-    db.Column('permission_id', UUID(as_uuid=True), db.ForeignKey('permissions.permission_id'), primary_key=True)
+    db.Column('permission_id', UUID(as_uuid=True), db.ForeignKey('permissions.permission_id'), primary_key=True),
+    db.Index('ix_role_permissions_permission_id', 'permission_id')
 )
 
 class Role(db.Model):
@@ -48,6 +50,10 @@ class Permission(db.Model):
 
 class User(db.Model):
     __tablename__ = "user"
+    __table_args__ = (
+        db.Index("ix_user_active_created_at", "created_at", "user_id", postgresql_where=db.text("is_deleted = false")),
+        db.Index("ix_user_reset_token", "reset_token", postgresql_where=db.text("reset_token IS NOT NULL")),
+    )
     user_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
@@ -62,6 +68,7 @@ class User(db.Model):
     password = db.Column(db.String(200), nullable=False)
     reset_token = db.Column(db.String(255), nullable=True)
     reset_token_expiry = db.Column(db.DateTime, nullable=True)
+    authz_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=db.func.now())
     updated_at = db.Column(db.DateTime, onupdate=db.func.now())
 
@@ -72,13 +79,19 @@ class User(db.Model):
         """
         Save user's password in hash
         """
-        self.password = generate_password_hash(password)
+        self.password = password_hasher.hash(password)
 
     def check_password(self, password):
         """
         Verify that password is correct or not
         """
-        return check_password_hash(self.password, password)
+        return password_hasher.verify(self.password, password)
+
+    def password_needs_rehash(self):
+        """
+        Check if the stored hash uses outdated algorithm or cost parameters
+        """
+        return password_hasher.needs_rehash(self.password)
 
     def generate_verification_code(self):
         """
@@ -131,6 +144,10 @@ class RecipeCategories(db.Model):
 
 class Recipe(db.Model):
     __tablename__ = "recipes"
+    __table_args__ = (
+        db.Index("ix_recipes_author_id_created_at", "author_id", "created_at", "recipe_id"),
+        db.Index("ix_recipes_category_id", "category_id"),
+    )
     
     recipe_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     author_id = db.Column(UUID(as_uuid=True), db.ForeignKey("user.user_id"), nullable=False)
@@ -153,6 +170,10 @@ class Recipe(db.Model):
     
 class Favorites(db.Model):
     __tablename__ = "favorites"
+    __table_args__ = (
+        db.Index("ix_favorites_user_id_recipe_id", "user_id", "recipe_id", unique=True),
+        db.Index("ix_favorites_recipe_id", "recipe_id"),
+    )
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4) 
     recipe_id = db.Column(UUID(as_uuid=True), db.ForeignKey("recipes.recipe_id"), nullable=False) 
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("user.user_id"), nullable=False) 
@@ -169,6 +190,10 @@ class Favorites(db.Model):
 
 class Comments (db.Model):
     __tablename__ = "comments"
+    __table_args__ = (
+        db.Index("ix_comments_recipe_id_created_at", "recipe_id", "created_at"),
+        db.Index("ix_comments_user_id", "user_id"),
+    )
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4) 
     recipe_id = db.Column(UUID(as_uuid=True), db.ForeignKey("recipes.recipe_id"), nullable=False) 
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("user.user_id"), nullable=False) 
@@ -184,6 +209,51 @@ class Comments (db.Model):
         return f"<Comments(id={self.id})>"
 
 
+class EmailOutbox(db.Model):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        db.Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    subject = db.Column(db.String(255), nullable=False)
+    recipients = db.Column(db.JSON, nullable=False)
+    template_name = db.Column(db.String(255), nullable=False)
+    context = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # naive UTC from the app clock, the one the worker compares and schedules with
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=db.func.now())
+    updated_at = db.Column(db.DateTime, onupdate=db.func.now())
+
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, status={self.status})>"
+
+
+class CacheVersion(db.Model):
+    """
+    Version counter per in-process cache; bumped in the writing transaction
+    so other nodes notice the change and reload.
+    """
+    __tablename__ = "cache_versions"
+
+    RECIPE_CATEGORIES = "recipe_categories"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now())
+
+    def __repr__(self):
+        return f"<CacheVersion(name={self.name}, version={self.version})>"
+
+
 
 
 
@@ -0,0 +1,174 @@
+import re
+import json
+import time
+import heapq
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_active_stats = contextvars.ContextVar("active_query_stats", default=())
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:[^()]*)\)", re.I)
+
+
+def fingerprint(statement):
+    """
+    Normalise a statement so repeats of the same query shape compare equal.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _IN_LIST.sub("IN (...)", statement)
+
+
+class QueryStats:
+    """
+    Queries recorded while this collector is active.
+    """
+
+    def __init__(self, keep_slowest=5):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints = Counter()
+        self.statements = []
+        self.keep_slowest = keep_slowest
+        self._slowest = []
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.total_time += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+        self.statements.append(statement)
+        entry = (elapsed, self.count, statement)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    @property
+    def slowest(self):
+        return [(elapsed, statement) for elapsed, _, statement in sorted(self._slowest, reverse=True)]
+
+    def repeated(self, threshold):
+        return {statement: count for statement, count in self.fingerprints.items() if count > threshold}
+
+
+def _push(stats):
+    return _active_stats.set(_active_stats.get() + (stats,))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    for stats in _active_stats.get():
+        stats.record(statement, elapsed)
+
+
+event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def capture_queries():
+    """
+    Record the SQL statements run inside the block.
+
+        with capture_queries() as stats:
+            client.get("/roles/get-roles")
+        print(stats.count, stats.total_time)
+    """
+    stats = QueryStats()
+    token = _push(stats)
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(n):
+    """
+    Fail unless the block runs at most `n` SQL statements.
+
+        with assert_max_queries(2):
+            client.get("/roles/get-roles")
+    """
+    with capture_queries() as stats:
+        yield stats
+
+    if stats.count > n:
+        listing = "\n".join(f"{index}. {statement}" for index, statement in enumerate(stats.statements, 1))
+        raise AssertionError(f"Expected at most {n} queries, {stats.count} were executed:\n{listing}")
+
+
+class SQLInstrumentation:
+    """
+    Per-request query count, DB time and slowest statements, with structured
+    warnings for slow queries and repeated statements (N+1).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get("SQL_STATS_ENABLED", True):
+            return
+        app.before_request(self._start)
+        app.after_request(self._report)
+        app.teardown_request(self._stop)
+
+    def _start(self):
+        g.query_stats = QueryStats(keep_slowest=current_app.config.get("SQL_SLOW_QUERY_TOP", 5))
+        g.query_stats_token = _push(g.query_stats)
+
+    def _stop(self, exc=None):
+        token = g.pop("query_stats_token", None)
+        if token is not None:
+            _active_stats.reset(token)
+
+    def _report(self, response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+
+        config = current_app.config
+        n_plus_one = config.get("SQL_N_PLUS_ONE_THRESHOLD", 5)
+        for statement, count in stats.repeated(n_plus_one).items():
+            current_app.logger.warning(json.dumps({
+                "event": "n_plus_one",
+                "endpoint": request.endpoint,
+                "path": request.path,
+                "count": count,
+                "statement": statement[:1000],
+            }))
+
+        slow_ms = config.get("SQL_SLOW_QUERY_MS", 200)
+        for elapsed, statement in stats.slowest:
+            if elapsed * 1000 < slow_ms:
+                break
+            current_app.logger.warning(json.dumps({
+                "event": "slow_query",
+                "endpoint": request.endpoint,
+                "path": request.path,
+                "duration_ms": round(elapsed * 1000, 2),
+                "statement": statement[:1000],
+            }))
+
+        if config.get("SQL_STATS_HEADERS") or current_app.debug:
+            response.headers["X-DB-Queries"] = str(stats.count)
+            response.headers["X-DB-Time"] = f"{stats.total_time * 1000:.2f}ms"
+        return response
@@ -0,0 +1,101 @@
+import json
+import itertools
+from functools import wraps
+from flask import g, request, has_request_context
+from flask_sqlalchemy.session import Session
+from flask_jwt_extended import get_jwt_identity
+from app.cache import TTLCache
+
+
+STICKY_COOKIE = "db_sticky"
+
+
+def _request_identity():
+    """
+    The authenticated user id if a JWT was verified for this request,
+    otherwise the client address.
+    """
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        identity = None
+    if identity:
+        return json.loads(identity).get("user_id")
+    return request.remote_addr
+
+
+class ReplicaRouter:
+    """
+    Picks a read replica for SELECTs issued by read-only endpoints.
+    After a client writes, its reads stay on the primary for
+    REPLICA_STICKY_SECONDS so it always sees its own changes.
+    """
+
+    def __init__(self, app=None):
+        self._counter = itertools.count()
+        self.bind_keys = []
+        self.selection = "round_robin"
+        self.sticky_seconds = 0
+        self.sticky = TTLCache()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.bind_keys = list(app.config.get("REPLICA_BIND_KEYS", []))
+        self.selection = app.config.get("REPLICA_SELECTION", "round_robin")
+        self.sticky_seconds = app.config.get("REPLICA_STICKY_SECONDS", 5)
+        self.sticky = TTLCache(maxsize=100000, ttl=self.sticky_seconds)
+        app.after_request(self._remember_writes)
+
+    def choose(self, engines):
+        if self.selection == "least_connections":
+            return min(self.bind_keys, key=lambda key: engines[key].pool.checkedout())
+        return self.bind_keys[next(self._counter) % len(self.bind_keys)]
+
+    def routes_reads(self):
+        """
+        True when SELECTs of the current request may go to a replica.
+        """
+        return bool(self.bind_keys) and has_request_context() \
+            and g.get("db_use_replica", False) and not g.get("db_wrote", False)
+
+    def is_sticky(self):
+        if request.cookies.get(STICKY_COOKIE):
+            return True
+        return self.sticky.get(str(_request_identity())) is not None
+
+    def _remember_writes(self, response):
+        if self.bind_keys and g.get("db_wrote", False):
+            self.sticky.set(str(_request_identity()), True)
+            response.set_cookie(STICKY_COOKIE, "1", max_age=self.sticky_seconds, httponly=True)
+        return response
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs to a read replica inside read-only endpoints
+    and everything else (flushes, DML, explicit binds) to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or getattr(clause, "is_dml", False):
+                g.db_wrote = True
+            elif getattr(clause, "is_select", False) and replica_router.routes_reads():
+                return self._db.engines[replica_router.choose(self._db.engines)]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_read_replica(fn):
+    """
+    Route the SELECTs of a read-only view to a replica, unless the
+    client wrote recently. Apply below @jwt_required so the user is known.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        g.db_use_replica = not replica_router.is_sticky()
+        return fn(*args, **kwargs)
+    return wrapper
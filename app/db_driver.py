@@ -1,5 +1,11 @@
+import io
+import json
+from config import Config
 from extentions import db
+from datetime import date
+from sqlalchemy import insert, update, bindparam, func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 
 def create_record(model, data_dict):
@@ -71,3 +77,210 @@ def create_multiple_records(model, data_list):
         raise e
 
 
+def insert_ignore_conflicts(table, rows, chunk_size=5000, commit=True):
+    """
+    Insert rows into a table with multi-row INSERT ... ON CONFLICT DO NOTHING,
+    one statement per chunk. Returns the number of rows actually inserted.
+    """
+    try:
+        inserted = 0
+        for start in range(0, len(rows), chunk_size):
+            stmt = pg_insert(table).values(rows[start:start + chunk_size]).on_conflict_do_nothing()
+            inserted += db.session.execute(stmt).rowcount
+        if commit:
+            db.session.commit()
+        return inserted
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise e
+
+
+def _table_of(model):
+    return getattr(model, "__table__", model)
+
+
+def _chunks(rows, chunk_size):
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+
+def _returning_columns(table, returning):
+    if returning is None:
+        return list(table.primary_key.columns)
+    return [table.c[name] for name in returning]
+
+
+def _onupdate_values(table, skip=()):
+    """
+    SQL-expression onupdate defaults (e.g. updated_at), which Core statements do not apply by themselves.
+    """
+    return {
+        column.key: column.onupdate.arg
+        for column in table.columns
+        if column.onupdate is not None and column.onupdate.is_clause_element and column.key not in skip
+    }
+
+
+def _apply_defaults(table, rows):
+    """
+    Fill Python-side column defaults in place. COPY bypasses SQLAlchemy,
+    so primary keys and timestamps have to be computed before streaming.
+    """
+    now = None
+    for column in table.columns:
+        default = column.default
+        if default is None:
+            continue
+        for row in rows:
+            if column.key in row:
+                continue
+            if default.is_callable:
+                row[column.key] = default.arg(None)
+            elif default.is_clause_element:
+                if now is None:
+                    # same value the database would use for func.now() in this transaction
+                    now = db.session.execute(db.select(func.now())).scalar()
+                row[column.key] = now
+            else:
+                row[column.key] = default.arg
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, date):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def _copy_rows(table, rows, columns):
+    """
+    Stream rows into a table with PostgreSQL COPY ... FROM STDIN (text format).
+    """
+    preparer = db.session.get_bind().dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(column.name) for column in columns)
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row.get(column.key)) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {preparer.format_table(table)} ({column_list}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
+def bulk_insert(model, rows, returning=None, chunk_size=None, copy_threshold=None, commit=True):
+    """
+    Insert many rows without building ORM instances.
+    Each chunk is one executemany INSERT ... RETURNING; on PostgreSQL, inputs of
+    at least `copy_threshold` rows are streamed with COPY instead.
+    Returns a list of mappings holding the `returning` columns (primary key by default).
+    """
+    table = _table_of(model)
+    chunk_size = chunk_size or Config.BULK_CHUNK_SIZE
+    copy_threshold = copy_threshold or Config.BULK_COPY_THRESHOLD
+    columns = _returning_columns(table, returning)
+    rows = [dict(row) for row in rows]
+    if not rows:
+        return []
+
+    try:
+        inserted = []
+        if len(rows) >= copy_threshold and db.session.get_bind().dialect.name == "postgresql":
+            _apply_defaults(table, rows)
+            copy_columns = [column for column in table.columns if column.key in rows[0]]
+            for chunk in _chunks(rows, chunk_size):
+                _copy_rows(table, chunk, copy_columns)
+                inserted.extend({column.key: row.get(column.key) for column in columns} for row in chunk)
+        else:
+            stmt = insert(table).returning(*columns, sort_by_parameter_order=True)
+            for chunk in _chunks(rows, chunk_size):
+                inserted.extend(db.session.execute(stmt, chunk).mappings().all())
+
+        if commit:
+            db.session.commit()
+        return inserted
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise e
+
+
+def bulk_upsert(model, rows, key, update_columns=None, returning=None, chunk_size=None, commit=True):
+    """
+    Insert many rows, updating the existing row on a conflict over `key`
+    (a list of column names backed by a unique index) with PostgreSQL
+    INSERT ... ON CONFLICT DO UPDATE. All rows must have the same keys.
+    Returns a list of mappings holding the `returning` columns.
+    """
+    table = _table_of(model)
+    chunk_size = chunk_size or Config.BULK_CHUNK_SIZE
+    columns = _returning_columns(table, returning)
+    rows = [dict(row) for row in rows]
+    if not rows:
+        return []
+
+    if update_columns is None:
+        primary_keys = {column.key for column in table.primary_key.columns}
+        update_columns = [name for name in rows[0] if name not in key and name not in primary_keys]
+
+    stmt = pg_insert(table)
+    set_values = {name: stmt.excluded[name] for name in update_columns}
+    set_values.update(_onupdate_values(table, skip=set_values))
+    if set_values:
+        stmt = stmt.on_conflict_do_update(index_elements=key, set_=set_values)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=key)
+    stmt = stmt.returning(*columns, sort_by_parameter_order=True)
+
+    try:
+        upserted = []
+        for chunk in _chunks(rows, chunk_size):
+            upserted.extend(db.session.execute(stmt, chunk).mappings().all())
+        if commit:
+            db.session.commit()
+        return upserted
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise e
+
+
+def bulk_update(model, rows, chunk_size=None, commit=True):
+    """
+    Update many rows by primary key with one executemany UPDATE per chunk.
+    Every row must contain the primary key and the same set of columns.
+    Returns the number of updated rows.
+    """
+    table = _table_of(model)
+    chunk_size = chunk_size or Config.BULK_CHUNK_SIZE
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    primary_keys = [column.key for column in table.primary_key.columns]
+    value_columns = [name for name in rows[0] if name not in primary_keys]
+    values = {name: bindparam(f"b_{name}") for name in value_columns}
+    values.update(_onupdate_values(table, skip=values))
+
+    stmt = update(table).values(values)
+    for name in primary_keys:
+        stmt = stmt.where(table.c[name] == bindparam(f"b_{name}"))
+
+    try:
+        updated = 0
+        for chunk in _chunks(rows, chunk_size):
+            params = [{f"b_{name}": value for name, value in row.items()} for row in chunk]
+            updated += db.session.execute(stmt, params).rowcount
+        if commit:
+            db.session.commit()
+        return updated
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise e
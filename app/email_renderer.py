@@ -0,0 +1,186 @@
+import re
+import threading
+from html.parser import HTMLParser
+from markupsafe import escape
+from flask import current_app
+from jinja2 import Undefined
+
+
+# private-use characters that cannot collide with template text
+SLOT_MARKER = "\ue000{}\ue001"
+SLOT_PATTERN = re.compile("\ue000(\\d+)\ue001")
+EXPRESSION_PATTERN = re.compile(r"{{(.*?)}}", re.S)
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Minimal HTML to plain-text conversion for the email text alternative.
+    """
+    SKIP_TAGS = {"head", "style", "script", "title"}
+    BLOCK_TAGS = {"p", "div", "br", "tr", "li", "table", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self.skip_depth = 0
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append("\n")
+        elif tag == "a":
+            self.links.append(dict(attrs).get("href"))
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append("\n")
+        elif tag == "a" and self.links:
+            href = self.links.pop()
+            if href and not self.skip_depth:
+                self.chunks.append(f" ({href})")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.chunks.append(data)
+
+
+def html_to_text(html):
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.chunks).splitlines())
+    return "\n\n".join(line for line in lines if line)
+
+
+class CompiledEmailTemplate:
+    """
+    An email template split into static text and per-recipient expressions.
+    Templates made only of `{{ expression }}` outputs are rendered by joining
+    the precomputed static parts with the evaluated expressions; templates
+    using blocks or comments fall back to a regular Jinja render.
+    """
+
+    def __init__(self, env, name):
+        self.name = name
+        self.template = env.get_template(name)
+        self.autoescape = env.autoescape(name) if callable(env.autoescape) else env.autoescape
+        self.statics, self.expressions = self._split(env, env.loader.get_source(env, name)[0])
+        self._text_statics, self._text_slots = self._text_skeleton() if self.is_split else (None, None)
+        # split templates are checked against a full Jinja render once, on
+        # the first send; until then renders are serialised
+        self.verified = not self.is_split
+        self._lock = threading.Lock()
+
+    def _split(self, env, source):
+        if any(token in source for token in ("{%", "{#", "{{-", "-}}")):
+            return None, None
+
+        pieces = EXPRESSION_PATTERN.split(source)
+        statics = [
+            piece.replace("\r\n", "\n").replace("\r", "\n").replace("\n", env.newline_sequence)
+            for piece in pieces[0::2]
+        ]
+        if not env.keep_trailing_newline and statics[-1].endswith(env.newline_sequence):
+            statics[-1] = statics[-1][:-len(env.newline_sequence)]
+
+        # one list expression evaluates every slot in a single Jinja context
+        expressions = env.compile_expression(f"[{', '.join(piece.strip() for piece in pieces[1::2])}]",
+                                             undefined_to_none=False)
+        return statics, expressions
+
+    @property
+    def is_split(self):
+        return self.statics is not None
+
+    def _values(self, context):
+        return ["" if isinstance(value, Undefined) else value for value in self.expressions(**context)]
+
+    def _join(self, values):
+        parts = [self.statics[0]]
+        for value, static in zip(values, self.statics[1:]):
+            parts.append(str(escape(value)) if self.autoescape else str(value))
+            parts.append(static)
+        return "".join(parts)
+
+    def render(self, context):
+        """
+        Return the (html, text) bodies for one recipient.
+        """
+        if not self.verified:
+            with self._lock:
+                if not self.verified:
+                    return self._verify(context)
+
+        if not self.is_split:
+            html = self.template.render(context)
+            return html, html_to_text(html)
+
+        values = self._values(context)
+        return self._join(values), self._render_text(values)
+
+    def _verify(self, context):
+        """
+        First render: compare the split against Jinja itself and fall back to
+        full renders if they differ. `verified` is set last, so other threads
+        never see the split change under them.
+        """
+        expected = self.template.render(context)
+        values = self._values(context)
+        if self._join(values) == expected:
+            result = expected, self._render_text(values)
+        else:
+            current_app.logger.warning(f"[MAIL] Template {self.name} cannot be split, using full renders")
+            self.statics = self.expressions = None
+            result = expected, html_to_text(expected)
+        self.verified = True
+        return result
+
+    def _text_skeleton(self):
+        pieces = SLOT_PATTERN.split(html_to_text(self._join_markers()))
+        return pieces[0::2], [int(index) for index in pieces[1::2]]
+
+    def _render_text(self, values):
+        parts = [self._text_statics[0]]
+        for index, static in zip(self._text_slots, self._text_statics[1:]):
+            parts.append(str(values[index]))
+            parts.append(static)
+        return "".join(parts)
+
+    def _join_markers(self):
+        parts = [self.statics[0]]
+        for index, static in enumerate(self.statics[1:]):
+            parts.append(SLOT_MARKER.format(index))
+            parts.append(static)
+        return "".join(parts)
+
+
+class EmailRenderer:
+    """
+    Precompiles the email templates at startup and renders HTML plus a
+    cached plain-text alternative for each send.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        templates = {}
+        app.extensions["email_renderer"] = templates
+        for name in app.config.get("EMAIL_TEMPLATES", []):
+            templates[name] = CompiledEmailTemplate(app.jinja_env, name)
+
+    def get_template(self, name):
+        templates = current_app.extensions["email_renderer"]
+        if name not in templates:
+            templates[name] = CompiledEmailTemplate(current_app.jinja_env, name)
+        return templates[name]
+
+    def render(self, template_name, context):
+        context = dict(context)
+        current_app.update_template_context(context)
+        return self.get_template(template_name).render(context)
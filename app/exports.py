@@ -0,0 +1,112 @@
+import io
+import csv
+import uuid
+import tempfile
+from contextlib import contextmanager
+import xlsxwriter
+from extentions import db
+
+
+# worksheet size limit of Excel, header row included
+XLSX_MAX_ROWS = 1048576
+
+
+def open_batches(statement, batch_size=1000):
+    """
+    Execute `statement` with a server-side cursor and return an iterator
+    over lists of at most `batch_size` rows, or None when there are no rows.
+    Call it inside the view so the read runs on the bind chosen for the
+    request; the rows are fetched while the response is being sent.
+    """
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    batches = result.partitions()
+    first = next(batches, None)
+    if first is None:
+        result.close()
+        return None
+    return _batches(result, first, batches)
+
+
+def _batches(result, first, batches):
+    try:
+        yield first
+        yield from batches
+    finally:
+        result.close()
+
+
+@contextmanager
+def _closing(batches):
+    """
+    contextlib.closing for any iterable of batches: generators such as
+    open_batches() are closed, lists and plain iterators need nothing.
+    """
+    try:
+        yield batches
+    finally:
+        close = getattr(batches, "close", None)
+        if close is not None:
+            close()
+
+
+def csv_chunks(header, batches):
+    """
+    Encode `batches` (any iterable of row lists) as CSV, one chunk per
+    batch, so memory stays bounded by the batch size instead of the table
+    size.
+    """
+    buffer = io.StringIO()
+    # same dialect pandas.to_csv wrote before
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header)
+    with _closing(batches):
+        for batch in batches:
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+def _xlsx_value(value):
+    return str(value) if isinstance(value, uuid.UUID) else value
+
+
+def write_xlsx(header, batches, sheet_name, spool_max_size, rows_per_sheet=XLSX_MAX_ROWS):
+    """
+    Write `batches` (any iterable of row lists) to a workbook in
+    xlsxwriter's constant_memory mode, which flushes every row as soon as
+    the next one starts. A new worksheet
+    (`sheet_name`, `sheet_name 2`, ...) with its own header is started every
+    `rows_per_sheet` rows. The workbook is kept in memory up to
+    `spool_max_size` bytes and in a temporary file beyond; it is returned
+    rewound.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+    workbook = xlsxwriter.Workbook(output, {
+        "constant_memory": True,
+        # cell text is user input, never a formula or a link
+        "strings_to_formulas": False,
+        "strings_to_urls": False,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+        "remove_timezone": True,
+    })
+    header_format = workbook.add_format({"bold": True, "border": 1})
+    worksheet = None
+    row_number = rows_per_sheet
+    try:
+        with _closing(batches):
+            for batch in batches:
+                for row in batch:
+                    if row_number == rows_per_sheet:
+                        suffix = f" {len(workbook.worksheets()) + 1}" if worksheet is not None else ""
+                        worksheet = workbook.add_worksheet(f"{sheet_name}{suffix}")
+                        worksheet.write_row(0, 0, header, header_format)
+                        row_number = 1
+                    worksheet.write_row(row_number, 0, [_xlsx_value(value) for value in row])
+                    row_number += 1
+        workbook.close()
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return output
@@ -0,0 +1,89 @@
+import uuid
+import decimal
+import dataclasses
+from datetime import date, time
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional, see Readme
+    orjson = None
+
+
+def _default(o):
+    """
+    Types outside JSON that both providers encode the same way: UUIDs as
+    their canonical string, dates and times as ISO 8601, Decimal as string
+    so no precision is lost.
+    """
+    if isinstance(o, (date, time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """
+    Flask's provider with ISO 8601 dates instead of HTTP dates, so the
+    output matches OrjsonProvider.
+    """
+
+    default = staticmethod(_default)
+    # values that can be handed over unformatted (see app.schemas.serializer)
+    native_types = True
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson. UUID, datetime, date and time are
+    encoded natively; anything else goes through `_default`.
+    """
+
+    native_types = True
+
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self._options("indent" in kwargs)).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    "stdlib": StdlibJSONProvider,
+    "orjson": OrjsonProvider,
+}
+
+
+def init_json_provider(app):
+    """
+    Install the provider named by JSON_PROVIDER: "orjson", "stdlib" or
+    "auto" (orjson when installed).
+    """
+    name = app.config.get("JSON_PROVIDER", "auto")
+    if name == "auto":
+        name = "orjson" if orjson is not None else "stdlib"
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown JSON_PROVIDER: {name}")
+    if name == "orjson" and orjson is None:
+        app.logger.warning("JSON_PROVIDER is orjson but orjson is not installed, using stdlib json")
+        name = "stdlib"
+    app.json = JSON_PROVIDERS[name](app)
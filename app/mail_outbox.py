@@ -0,0 +1,135 @@
+import time
+import random
+import threading
+import click
+from config import Config
+from extentions import db
+from datetime import datetime, timedelta
+from flask import current_app
+from flask.cli import with_appcontext
+from app.smtp_pool import smtp_pool
+from app.utils import build_email_message
+from app.database.models import EmailOutbox
+
+
+def backoff_delay(attempts):
+    """
+    Exponential backoff with jitter, capped at MAIL_OUTBOX_BACKOFF_MAX seconds.
+    """
+    delay = min(Config.MAIL_OUTBOX_BACKOFF_BASE * (2 ** (attempts - 1)), Config.MAIL_OUTBOX_BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_due_emails(batch_size):
+    """
+    Lock a batch of due emails. SKIP LOCKED lets several workers drain
+    the outbox concurrently without picking the same rows.
+    """
+    return (EmailOutbox.query
+            .filter(EmailOutbox.status == EmailOutbox.STATUS_PENDING,
+                    EmailOutbox.next_attempt_at <= datetime.utcnow())
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all())
+
+
+def record_failure(email, error):
+    email.attempts += 1
+    email.last_error = str(error)[:2000]
+    if email.attempts >= Config.MAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = EmailOutbox.STATUS_FAILED
+        current_app.logger.error(f"[MAIL] Giving up on email {email.id} after {email.attempts} attempts: {error}")
+    else:
+        email.next_attempt_at = datetime.utcnow() + backoff_delay(email.attempts)
+        current_app.logger.warning(f"[MAIL] Delivery of email {email.id} failed, attempt {email.attempts}: {error}")
+
+
+def process_outbox_batch(batch_size):
+    """
+    Deliver one batch of due emails over a single pooled SMTP session
+    and record the outcome of each. Returns the number of emails processed.
+    """
+    emails = claim_due_emails(batch_size)
+
+    rendered = []
+    for email in emails:
+        try:
+            message = build_email_message(email.subject, email.recipients, email.template_name, email.context)
+            rendered.append((email, message))
+        except Exception as e:
+            record_failure(email, e)
+
+    results = smtp_pool.send_batch([message for _, message in rendered])
+    for (email, _), error in zip(rendered, results):
+        if error is None:
+            email.status = EmailOutbox.STATUS_SENT
+            email.sent_at = datetime.utcnow()
+            email.last_error = None
+        else:
+            record_failure(email, error)
+
+    db.session.commit()
+    if emails:
+        current_app.logger.info(f"[MAIL] Processed {len(emails)} emails, pool stats: {smtp_pool.stats()}")
+    return len(emails)
+
+
+def run_worker(app, batch_size, poll_interval, stop_event):
+    while not stop_event.is_set():
+        processed = 0
+        with app.app_context():
+            try:
+                processed = process_outbox_batch(batch_size)
+            except Exception:
+                db.session.rollback()
+                app.logger.error("[MAIL] Outbox worker error", exc_info=True)
+
+        # keep draining while there is a backlog
+        if processed < batch_size:
+            stop_event.wait(poll_interval)
+
+
+@click.command("mail-worker")
+@click.option("--threads", type=int, default=None, help="Number of delivery threads.")
+@click.option("--batch-size", type=int, default=None, help="Emails claimed per transaction.")
+@click.option("--once", is_flag=True, help="Drain the due emails once and exit.")
+@with_appcontext
+def mail_worker(threads, batch_size, once):
+    """Deliver queued emails from the outbox"""
+    app = current_app._get_current_object()
+    threads = threads or Config.MAIL_WORKER_THREADS
+    batch_size = batch_size or Config.MAIL_WORKER_BATCH_SIZE
+
+    if once:
+        total = 0
+        while True:
+            processed = process_outbox_batch(batch_size)
+            total += processed
+            if processed < batch_size:
+                break
+        smtp_pool.close_all()
+        click.echo(f"Processed {total} emails.")
+        return
+
+    stop_event = threading.Event()
+    workers = [
+        threading.Thread(target=run_worker,
+                         args=(app, batch_size, Config.MAIL_WORKER_POLL_INTERVAL, stop_event),
+                         name=f"mail-worker-{index}",
+                         daemon=True)
+        for index in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    click.echo(f"Mail worker started with {threads} threads.")
+
+    try:
+        while any(worker.is_alive() for worker in workers):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        click.echo("Stopping mail worker...")
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+        smtp_pool.close_all()
@@ -7,4 +7,7 @@ USER_NOT_FOUND = "User does not exist"
 INVALID_PASSWORD = "Invalid password"
 GENERIC_ERROR = "Something went wrong"
 MISSING_JSON = "Missing or invalid JSON body {}"
-RECIPE_CATEGORIES_CREATED = "Recipe categories created successfully"
\ No newline at end of file
+RECIPE_CATEGORIES_CREATED = "Recipe categories created successfully"
+RECIPE_CATEGORIES_FETCHED = "Recipe categories fetched successfully"
+CATEGORY_NOT_FOUND = "Category does not exist"
+SERVER_BUSY = "Server is busy, please try again"
\ No newline at end of file
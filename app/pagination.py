@@ -0,0 +1,208 @@
+import uuid
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import inspect, text, tuple_
+from sqlalchemy.orm import undefer
+from itsdangerous import URLSafeSerializer, BadSignature
+from config import Config
+from app.cache import TTLCache
+
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATED)
+
+# compiled count query -> exact total
+count_cache = TTLCache(maxsize=Config.PAGINATION_COUNT_CACHE_SIZE, ttl=Config.PAGINATION_COUNT_CACHE_TTL)
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised for cursors that were tampered with or do not fit the listing.
+    """
+
+
+class InvalidFieldset(ValueError):
+    """
+    Raised when `?fields=` or `?exclude=` names a field the schema lacks.
+    """
+
+
+class InvalidPageSize(ValueError):
+    """
+    Raised for a `?per_page=` below 1.
+    """
+
+
+def page_size(per_page):
+    """
+    Validate `?per_page=` and cap it at PAGINATION_MAX_PER_PAGE.
+    """
+    if per_page is None or per_page < 1:
+        raise InvalidPageSize("per_page must be a positive integer")
+    return min(per_page, current_app.config["PAGINATION_MAX_PER_PAGE"])
+
+
+def parse_fieldset(value):
+    """
+    Split a comma separated `?fields=`/`?exclude=` value into field names.
+    Nested fields use dots, e.g. `title,author.email`. Names come back
+    sorted and deduplicated.
+    """
+    if not value:
+        return None
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    # one canonical form per field set, whatever the order or repeats
+    return tuple(sorted(names)) or None
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.config["SECRET_KEY"], salt="pagination-cursor")
+
+
+def _sort_columns(query):
+    """
+    Keyset order for a query: (created_at, primary key) of its model.
+    """
+    model = query.column_descriptions[0]["entity"]
+    return model.created_at, inspect(model).primary_key[0]
+
+
+def encode_cursor(row, columns, direction):
+    created_at, pk = (getattr(row, column.key) for column in columns)
+    return _serializer().dumps({"k": [created_at.isoformat(), str(pk)], "d": direction})
+
+
+def decode_cursor(token):
+    try:
+        payload = _serializer().loads(token)
+        created_at, pk = payload["k"]
+        direction = payload["d"]
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return (datetime.fromisoformat(created_at), uuid.UUID(pk)), direction
+    except (BadSignature, KeyError, TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def keyset_page(query, per_page, cursor=None):
+    """
+    Fetch one page ordered by (created_at, id) starting after `cursor`.
+    Uses `WHERE (created_at, id) > (...) LIMIT n + 1` instead of OFFSET and
+    never counts the full result. Returns (items, next_cursor, prev_cursor).
+    """
+    columns = _sort_columns(query)
+    key = tuple_(*columns)
+    direction = "next"
+    # the cursor is built from created_at even when a sparse fieldset omits it
+    query = query.options(undefer(columns[0]))
+
+    if cursor:
+        values, direction = decode_cursor(cursor)
+        if direction == "next":
+            query = query.filter(key > tuple_(*values))
+        else:
+            query = query.filter(key < tuple_(*values))
+
+    if direction == "next":
+        query = query.order_by(*(column.asc() for column in columns))
+    else:
+        query = query.order_by(*(column.desc() for column in columns))
+
+    items = query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if direction == "prev":
+        items.reverse()
+
+    if not items:
+        return items, None, None
+
+    more_after = has_more if direction == "next" else True
+    more_before = bool(cursor) if direction == "next" else has_more
+    next_cursor = encode_cursor(items[-1], columns, "next") if more_after else None
+    prev_cursor = encode_cursor(items[0], columns, "prev") if more_before else None
+    return items, next_cursor, prev_cursor
+
+
+def exact_count(query):
+    return query.order_by(None).count()
+
+
+def _count_cache_key(query):
+    """
+    Normalized SQL of the query plus its filter values.
+    """
+    from extentions import db
+
+    compiled = query.order_by(None).statement.compile(dialect=db.session.get_bind().dialect)
+    return str(compiled), tuple(sorted((name, str(value)) for name, value in compiled.params.items()))
+
+
+def cached_count(query):
+    """
+    Exact count reused for PAGINATION_COUNT_CACHE_TTL seconds per distinct
+    set of filters. Writes show up in `total` once the entry expires or is
+    dropped with `invalidate_count`.
+    """
+    return count_cache.get_or_set(_count_cache_key(query), lambda: exact_count(query))
+
+
+def invalidate_count(query):
+    """
+    Drop the cached total of `query`. Call after a committed write that
+    changes its rows, with the query the listing counts.
+    """
+    count_cache.pop(_count_cache_key(query))
+
+
+def estimated_count(query):
+    """
+    Planner row estimate: pg_class.reltuples for an unfiltered table scan,
+    otherwise the top-level row estimate of EXPLAIN. Returns None when no
+    estimate is available (non-PostgreSQL database).
+    """
+    from extentions import db
+
+    bind = db.session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    query = query.order_by(None)
+    model = query.column_descriptions[0]["entity"]
+    if query.whereclause is None:
+        estimate = db.session.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": model.__table__.fullname},
+        ).scalar()
+    else:
+        sql = query.statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+        plan = db.session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        estimate = plan[0]["Plan"]["Plan Rows"]
+
+    # reltuples is -1 for tables that were never vacuumed or analyzed
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def count_total(query, strategy=COUNT_EXACT):
+    """
+    Total rows of `query` using `strategy`. Returns (total, is_exact).
+    Small or unavailable estimates fall back to an exact count; cached
+    counts may be up to PAGINATION_COUNT_CACHE_TTL seconds old and are
+    reported as not exact.
+    """
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(f"Unknown count strategy: {strategy}")
+
+    if strategy == COUNT_ESTIMATED:
+        estimate = estimated_count(query)
+        if estimate is not None and estimate >= current_app.config["PAGINATION_EXACT_COUNT_BELOW"]:
+            return estimate, False
+        return exact_count(query), True
+
+    if strategy == COUNT_CACHED:
+        return cached_count(query), False
+    return exact_count(query), True
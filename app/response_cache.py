@@ -0,0 +1,223 @@
+import json
+import threading
+from functools import wraps
+from urllib.parse import urlencode
+from flask import request, make_response, current_app, g
+from app.cache import TTLCache
+
+
+class CachedResponse:
+    """
+    Status, mimetype and body of a cached view response.
+    """
+
+    __slots__ = ("status", "mimetype", "body")
+
+    def __init__(self, status, mimetype, body):
+        self.status = status
+        self.mimetype = mimetype
+        self.body = body
+
+    def to_bytes(self):
+        header = json.dumps({"status": self.status, "mimetype": self.mimetype}).encode()
+        return header + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, data):
+        header, body = data.split(b"\n", 1)
+        meta = json.loads(header)
+        return cls(meta["status"], meta["mimetype"], body)
+
+
+class MemoryBackend:
+    """
+    Per-process backend on top of TTLCache, with a tag -> keys index.
+    Invalidation only reaches the process that handled the write, so
+    multi-worker deployments should use RedisBackend.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, ttl, tags):
+        self.cache.set(key, value, ttl)
+        with self._lock:
+            for tag in tags:
+                keys = self._tags.setdefault(tag, set())
+                keys.add(key)
+                # drop keys the LRU has already evicted or expired
+                if len(keys) > self.cache.maxsize:
+                    keys.intersection_update(k for k in list(keys) if k in self.cache)
+
+    def invalidate(self, tags):
+        with self._lock:
+            keys = set().union(*(self._tags.pop(tag, set()) for tag in tags))
+        for key in keys:
+            self.cache.pop(key)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._tags.clear()
+        self.cache.clear()
+
+    def stats(self):
+        return {"backend": "memory", **self.cache.stats()}
+
+
+class RedisBackend:
+    """
+    Backend for any Redis-protocol server (7.0+ for EXPIRE NX/GT), shared
+    by all workers. Each tag is a set of keys that lives as long as the
+    longest-lived entry added to it.
+    """
+
+    def __init__(self, client, prefix="response-cache:"):
+        self.client = client
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def _tag_key(self, tag):
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key):
+        data = self.client.get(self.prefix + key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResponse.from_bytes(data)
+
+    def set(self, key, value, ttl, tags):
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, value.to_bytes(), ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), self.prefix + key)
+            # set the first expiry, then only ever extend it, so a short-lived
+            # entry never lets the tag expire before older keys it still lists
+            pipe.expire(self._tag_key(tag), ttl, nx=True)
+            pipe.expire(self._tag_key(tag), ttl, gt=True)
+        pipe.execute()
+
+    def invalidate(self, tags):
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        pipe = self.client.pipeline()
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = set().union(*pipe.execute())
+        self.client.delete(*keys, *tag_keys)
+        return len(keys)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        try:
+            evictions = self.client.info("stats").get("evicted_keys", 0)
+        except Exception:
+            evictions = None
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses, "evictions": evictions}
+
+
+def _cache_key(per_user):
+    """
+    Endpoint, user and the query string with its arguments sorted, plus the
+    ETag of an enclosing @conditional_get: a write changes the key even
+    when the tag invalidation did not reach this cache.
+    """
+    user = "*"
+    if per_user:
+        from app.auth.auth_decorators import get_current_user_id
+        user = get_current_user_id()
+    args = urlencode(sorted(request.args.items(multi=True)))
+    return f"{request.endpoint}|{user}|{args}|{g.get('conditional_etag', '')}"
+
+
+class ResponseCache:
+    """
+    Response cache for read views. RESPONSE_CACHE_BACKEND selects "memory",
+    "redis" (RESPONSE_CACHE_REDIS_URL) or "none".
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get("RESPONSE_CACHE_BACKEND", "memory")
+        ttl = app.config.get("RESPONSE_CACHE_TTL", 30)
+        if backend == "memory":
+            self.backend = MemoryBackend(app.config.get("RESPONSE_CACHE_SIZE", 1024), ttl)
+        elif backend == "redis":
+            import redis
+
+            client = redis.Redis.from_url(app.config["RESPONSE_CACHE_REDIS_URL"])
+            self.backend = RedisBackend(client, app.config.get("RESPONSE_CACHE_PREFIX", "response-cache:"))
+        elif backend == "none":
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend}")
+
+    def cached(self, tags, ttl=None, per_user=False):
+        """
+        Cache 200 responses of a GET view under its endpoint, the current
+        user (with `per_user`) and its query arguments. `tags` is a list or
+        a callable returning one, used by `invalidate`. Apply below
+        @jwt_required and @conditional_get.
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                if backend is None or request.method != "GET":
+                    return fn(*args, **kwargs)
+
+                key = _cache_key(per_user)
+                try:
+                    cached = backend.get(key)
+                except Exception as e:
+                    current_app.logger.warning(f"[CACHE] Read of {key} failed: {e}")
+                    return fn(*args, **kwargs)
+                if cached is not None:
+                    response = make_response(cached.body, cached.status)
+                    response.mimetype = cached.mimetype
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    entry = CachedResponse(response.status_code, response.mimetype, response.get_data())
+                    entry_tags = tags() if callable(tags) else tags
+                    try:
+                        backend.set(key, entry, ttl or current_app.config.get("RESPONSE_CACHE_TTL", 30), entry_tags)
+                    except Exception as e:
+                        current_app.logger.warning(f"[CACHE] Write of {key} failed: {e}")
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        """
+        Drop every cached response carrying one of `tags`. Call after the
+        write has been committed.
+        """
+        if self.backend is None or not tags:
+            return 0
+        try:
+            return self.backend.invalidate(tags)
+        except Exception as e:
+            current_app.logger.error(f"[CACHE] Invalidation of {tags} failed: {e}")
+            return 0
+
+    def stats(self):
+        return self.backend.stats() if self.backend is not None else {"backend": "none"}
@@ -3,6 +3,8 @@ from flask import Blueprint, request, jsonify, render_template
 from app.database.models import User, Favorites, Comments
 from extentions import db
 from app.schemas.interactions_schema import CommentsSchema
+from app.schemas.serializer import fast_dump
+from app.auth.identity_cache import get_active_user
 from app.utils import response, is_valid_email, generate_access_token_and_refresh_token, send_verification_email, paginated_result, send_email
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
@@ -13,10 +15,12 @@ from datetime import datetime, timedelta
 
 bp = Blueprint("interactions", __name__, url_prefix="/interactions")
 
+comments_schema = CommentsSchema()
+
 @bp.route("/comments", methods=["POST"])
 @jwt_required()
 def create_comment():
-    schema = CommentsSchema()
+    schema = comments_schema
     
     try:
         data = request.get_json()
@@ -30,7 +34,7 @@ def create_comment():
             return jsonify(response(False, "Validation failed", error=err.messages)), 400
 
         # Check user existence
-        user = User.query.filter_by(user_id=user_id, is_deleted=False, is_verified=True).first()
+        user = get_active_user(user_id)
         if not user:
             return jsonify(response(False, "User does not exist")), 400
 
@@ -40,7 +44,7 @@ def create_comment():
             db.session.add(comment)
             db.session.commit()
             
-            comment_data = schema.dump(comment)
+            comment_data = fast_dump(schema, comment)
             return jsonify(response(True, "Comment created successfully", comment_data)), 201
 
         except Exception as e:
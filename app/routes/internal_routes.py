@@ -0,0 +1,35 @@
+from flask import Blueprint, jsonify
+from extentions import db, response_cache
+from app.utils import response
+from app.auth.auth_decorators import permission_required
+from app.database.pool_metrics import pool_status
+
+bp = Blueprint("internal", __name__, url_prefix="/internal")
+
+
+@bp.route("/db-pool", methods=["GET"])
+@permission_required("view_metrics")
+def get_db_pool_metrics():
+    """
+    Connection pool gauges for every configured database engine.
+    """
+    try:
+        pools = {
+            bind_key or "default": pool_status(engine)
+            for bind_key, engine in db.engines.items()
+        }
+        return jsonify(response(True, "Pool metrics fetched successfully", pools)), 200
+    except Exception as e:
+        return jsonify(response(False, "Something went wrong", error=str(e))), 500
+
+
+@bp.route("/response-cache", methods=["GET"])
+@permission_required("view_metrics")
+def get_response_cache_metrics():
+    """
+    Hit, miss and eviction counters of the response cache.
+    """
+    try:
+        return jsonify(response(True, "Cache metrics fetched successfully", response_cache.stats())), 200
+    except Exception as e:
+        return jsonify(response(False, "Something went wrong", error=str(e))), 500
@@ -1,8 +1,10 @@
 import json
 from flask import Blueprint, request, jsonify, render_template
 from app.database.models import Permission
-from extentions import db
+from extentions import db, response_cache
 from app.schemas.permission_schema import PermissionSchema
+from app.database.replica import use_read_replica
+from app.conditional import conditional_get, freshness
 from app.utils import response, generate_access_token_and_refresh_token, send_verification_email, paginated_result, send_email
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
@@ -31,6 +33,7 @@ def create_permission():
         permission = Permission(**validated_data)
         db.session.add(permission)
         db.session.commit()
+        response_cache.invalidate("permissions")
 
         Permission_data = schema.dump(permission)
         return jsonify(response(True, "Permission created successfully", Permission_data)), 201
@@ -39,6 +42,9 @@ def create_permission():
     
 
 @bp.route('/get-permissions', methods=['GET'])
+@use_read_replica
+@conditional_get(lambda: [freshness(Permission)])
+@response_cache.cached(tags=["permissions"])
 def get_permissions():
     try:
         schema = PermissionSchema(many=True)  # many=True for list serialization
@@ -1,25 +1,35 @@
-import io
-import pandas as pd
 import json
-from extentions import db
+from config import Config
+from extentions import db, response_cache
 import app.messages as messages
 from marshmallow import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
-from flask import Blueprint, request, jsonify,Response
-from app.auth.auth_decorators import permission_required
+from flask import Blueprint, request, jsonify,Response, stream_with_context, send_file
+from app.auth.auth_decorators import permission_required, get_current_user_id
+from app.auth.identity_cache import get_active_user
+from app.database.replica import use_read_replica
+from app.category_registry import category_registry
+from app.conditional import conditional_get, freshness
+from app.pagination import InvalidCursor, InvalidFieldset, InvalidPageSize, COUNT_CACHED, invalidate_count
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.database.models import User, Recipe, RecipeCategories
 from app.utils import response, paginated_result, send_email, validate_schema
 from app.schemas.schema import RecipeSchema, RecipeCategoryListSchema, RecipeCategorySchema
+from app.schemas.serializer import fast_dump
+from app.exports import open_batches, csv_chunks, write_xlsx
 from app.db_driver import (get_record_by, 
                            update_record,
                            create_record,
                            delete_record,
                            get_all_records, 
-                           create_multiple_records)
+                           bulk_insert)
 
 bp = Blueprint("recipes", __name__, url_prefix="/recipe")
 
+recipe_schema = RecipeSchema()
+
+RECIPE_EXPORT_COLUMNS = ["recipe_id", "author_id", "title", "description", "content", "created_at", "updated_at"]
+
 @bp.route("/add-category", methods=["POST"])
 @permission_required("create_category")
 def create_categories():
@@ -33,22 +43,49 @@ def create_categories():
         if not is_valid:
             return jsonify(response(message=messages.VALIDATION_FAILED, error=result)), 400
         
-        user = get_record_by(User, user_id=user_id, is_verified=True, is_deleted=False)
+        user = get_active_user(user_id)
         if not user:
             return jsonify(response(message=messages.USER_NOT_FOUND)), 404
 
 
         category_names = list(set(result['categories']))  
         categories_data = [{"category_name": name} for name in category_names]
-        new_categories = create_multiple_records(RecipeCategories, categories_data)
+        new_categories = bulk_insert(RecipeCategories, categories_data,
+                                     returning=["category_id", "category_name", "created_at", "updated_at"],
+                                     commit=False)
+        category_registry.bump_version()
+        db.session.commit()
+        category_registry.reload()
         serialized = RecipeCategorySchema(many=True).dump(new_categories)
+        response_cache.invalidate("recipe_categories")
 
         return jsonify(response(True, messages.RECIPE_CATEGORIES_CREATED, serialized)), 201
 
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(response(message=messages.GENERIC_ERROR, error=str(e))), 500
+
+
+@bp.route("/categories", methods=["GET"])
+def get_categories():
+    """
+    List recipe categories from the in-process registry.
+    """
+    try:
+        categories = RecipeCategorySchema(many=True).dump(category_registry.all())
+        return jsonify(response(True, messages.RECIPE_CATEGORIES_FETCHED, categories)), 200
     except Exception as e:
         return jsonify(response(message=messages.GENERIC_ERROR, error=str(e))), 500
 
     
+def author_recipes(user_id):
+    """
+    Listing query of /recipe/user, shared with the writes that drop its
+    cached count.
+    """
+    return Recipe.query.filter_by(author_id=user_id)
+
+
 @bp.route("/add-recipe", methods=["POST"])
 @jwt_required()
 def create_recipe():
@@ -57,9 +94,9 @@ def create_recipe():
         user_id = user_data.get('user_id')
 
         data = request.get_json()
-        schema = RecipeSchema()
+        schema = recipe_schema
 
-        user = User.query.filter_by(user_id=user_id, is_verified=True, is_deleted=False).first()
+        user = get_active_user(user_id)
         if not user:
             return jsonify(response(False, "User not found")), 404
 
@@ -71,7 +108,6 @@ def create_recipe():
         try:
             new_recipe = Recipe(**validated_data)
             db.session.add(new_recipe)
-            db.session.commit()
             send_email(
                 subject="Thank You for Sharing Your Recipe",
                 recipients=[user.email],
@@ -82,8 +118,11 @@ def create_recipe():
                     'app_name':  "Golden Recipe!!"
                 }
             )
+            db.session.commit()
+            response_cache.invalidate(f"recipes:author:{user_id}")
+            invalidate_count(author_recipes(user_id))
 
-            recipe_data = schema.dump(new_recipe)
+            recipe_data = fast_dump(schema, new_recipe)
             return jsonify(response(True, "Recipe created successfully", recipe_data)), 201
         except Exception as e:
             db.session.rollback()
@@ -95,6 +134,12 @@ def create_recipe():
 
 @bp.route("/user", methods=["GET"])
 @jwt_required()
+@use_read_replica
+@conditional_get(lambda: [freshness(Recipe, Recipe.author_id == get_current_user_id()),
+                          freshness(User, User.user_id == get_current_user_id())], per_user=True)
+@response_cache.cached(per_user=True, tags=lambda: [f"recipes:author:{get_current_user_id()}",
+                                                     f"user:{get_current_user_id()}",
+                                                     "recipe_categories"])
 # @permission_required("create_comment")
 def get_recipes_by_user():
     try:
@@ -103,17 +148,19 @@ def get_recipes_by_user():
         user_id = user_data.get('user_id')
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor')
 
         if not user_id:
             return jsonify(response(False, "User ID not found in token")), 400
         
-        user = User.query.filter_by(user_id = user_id, is_verified = True, is_deleted = False).first()
+        user = get_active_user(user_id)
         if not user:
             return jsonify(response(False, "User not found or not verified")), 404
         
         # recipes = Recipe.query.filter_by(author_id=user_id).all()
-        query = Recipe.query.filter_by(author_id = user_id)
-        result = paginated_result(query, RecipeSchema, page, per_page)
+        query = author_recipes(user_id)
+        result = paginated_result(query, RecipeSchema, page, per_page, cursor=cursor, count_strategy=COUNT_CACHED,
+                                  fields=request.args.get('fields'), exclude=request.args.get('exclude'))
         response_data = {
             'data': result['data'],
             'meta': result['pagination']
@@ -124,15 +171,21 @@ def get_recipes_by_user():
 
         return jsonify(response(True, "Recipes retrieved successfully", response_data)), 200
 
+    except (InvalidCursor, InvalidFieldset, InvalidPageSize) as e:
+        return jsonify(response(False, str(e))), 400
     except Exception as e:
         return jsonify(response(False, "Something went wrong", error=str(e))), 500
 
 
 @bp.route("/download-recipes", methods=["GET"])
 @jwt_required()
+@use_read_replica
 def download_recipes():
     """
     Download recipe data in Excel or CSV format.
+    Rows are read from a server-side cursor in EXPORT_BATCH_SIZE batches;
+    CSV is streamed as it is encoded, Excel is sent once the workbook is
+    complete.
     Requires a valid JWT token for authentication.
     """
     try:
@@ -140,40 +193,26 @@ def download_recipes():
         if file_format not in ['csv', 'excel']:
             return jsonify(response(False, "Invalid format. Use 'csv' or 'excel'")), 400
 
-        recipes = Recipe.query.all()
-        if not recipes:
+        statement = db.select(*(getattr(Recipe, column) for column in RECIPE_EXPORT_COLUMNS))
+        batches = open_batches(statement, Config.EXPORT_BATCH_SIZE)
+        if batches is None:
             return jsonify(response(False, "No recipes found")), 404
 
-        recipe_data = [{
-            "recipe_id": recipe.recipe_id,
-            "author_id": recipe.author_id,
-            "title" : recipe.title,
-            "description": recipe.description,
-            "content" : recipe.content,
-            "created_at": recipe.created_at,
-            "updated_at": recipe.updated_at
-        } for recipe in recipes]
-        df = pd.DataFrame(recipe_data)
-
         if file_format == 'csv':
-            output = io.StringIO()
-            df.to_csv(output, index=False)
-            output.seek(0)
             return Response(
-                output,
+                stream_with_context(csv_chunks(RECIPE_EXPORT_COLUMNS, batches)),
                 mimetype='text/csv',
                 headers={"Content-Disposition": "attachment;filename=recipes.csv"}
             )
-        elif file_format == 'excel':
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                df.to_excel(writer, index=False, sheet_name='Recipes')
-            output.seek(0)
-            return Response(
-                output,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                headers={"Content-Disposition": "attachment;filename=recipes.xlsx"}
-            )
+
+        output = write_xlsx(RECIPE_EXPORT_COLUMNS, batches, 'Recipes', Config.EXPORT_SPOOL_MAX_SIZE)
+        # sent in blocks; the spooled file is closed with the response
+        return send_file(
+            output,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name='recipes.xlsx'
+        )
 
     except SQLAlchemyError as db_err:
         return jsonify(response(False, "Database error occurred", error=str(db_err))), 500
@@ -1,8 +1,14 @@
 import json
 from flask import Blueprint, request, jsonify, render_template
-from app.database.models import User, Role, Permission
-from extentions import db
+from app.database.models import User, Role, Permission, user_roles, role_permissions
+from extentions import db, response_cache
+from app.db_driver import insert_ignore_conflicts
+from app.auth.auth_decorators import permission_required
+from app.database.replica import use_read_replica
+from app.conditional import conditional_get, freshness
 from app.schemas.role_schema import RoleSchema
+from app.auth.permission_cache import invalidate_permissions, bump_authz_version
+from app.auth.identity_cache import invalidate_identity
 from app.utils import response, generate_access_token_and_refresh_token, send_verification_email, paginated_result, send_email
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
@@ -31,6 +37,7 @@ def create_role():
         role = Role(**validated_data)
         db.session.add(role)
         db.session.commit()
+        response_cache.invalidate("roles")
 
         role_data = schema.dump(role)
         return jsonify(response(True, "Role created successfully", role_data)), 201
@@ -38,6 +45,9 @@ def create_role():
             return jsonify(response(False, "Something went wrong", error=str(e))), 500
 
 @bp.route('/get-roles', methods=['GET'])
+@use_read_replica
+@conditional_get(lambda: [freshness(Role)])
+@response_cache.cached(tags=["roles"])
 def get_roles():
     try:
         schema = RoleSchema(many=True)  
@@ -62,7 +72,10 @@ def assign_permissions_to_role(role_id):
         if perm and perm not in role.permissions:
             role.permissions.append(perm)
 
+    bump_authz_version(role_id=role.role_id)
     db.session.commit()
+    # the role may be held by any number of users
+    invalidate_permissions()
     return jsonify({"message": "Permissions assigned to role"}), 200
 
 @bp.route('/users/<user_id>/assign-roles', methods=['POST'])
@@ -77,5 +90,158 @@ def assign_roles_to_user(user_id):
         if role and role not in user.roles:
             user.roles.append(role)
 
+    bump_authz_version(user_ids=[user.user_id])
     db.session.commit()
+    invalidate_permissions(user.user_id)
+    invalidate_identity(user.user_id)
     return jsonify({"message": "Roles assigned to user"}), 200
+
+
+def parse_uuid_list(values):
+    """
+    Split raw ids into a de-duplicated list of UUIDs and the values that are not UUIDs.
+    """
+    valid, invalid = {}, []
+    for value in values or []:
+        try:
+            parsed = uuid.UUID(str(value))
+            valid[parsed] = None
+        except ValueError:
+            invalid.append(value)
+    return list(valid), invalid
+
+
+def resolve_existing_ids(id_column, ids):
+    """
+    Return the subset of `ids` present in `id_column`, using a single IN query.
+    """
+    if not ids:
+        return set()
+    return set(db.session.scalars(db.select(id_column).where(id_column.in_(ids))))
+
+
+def resolve_linked_ids(table, fixed_column, fixed_id, other_column, ids):
+    """
+    Return the subset of `ids` already linked to `fixed_id` in `table`.
+    """
+    if not ids:
+        return set()
+    return set(db.session.scalars(
+        db.select(table.c[other_column]).where(table.c[fixed_column] == fixed_id, table.c[other_column].in_(ids))
+    ))
+
+
+def bulk_assign(table, fixed_column, fixed_id, other_column, other_ids, other_id_column, bump):
+    """
+    Link one id to many ids through an association table.
+    Unknown ids are reported instead of failing the whole call, and
+    `bump` is only called with the ids that gain a link, so repeating a
+    call does not revoke anyone's tokens.
+    """
+    ids, invalid = parse_uuid_list(other_ids)
+    existing = resolve_existing_ids(other_id_column, ids)
+    linked = resolve_linked_ids(table, fixed_column, fixed_id, other_column, existing)
+    rows = [{fixed_column: fixed_id, other_column: other_id} for other_id in ids
+            if other_id in existing and other_id not in linked]
+
+    if rows:
+        bump([row[other_column] for row in rows])
+    assigned = insert_ignore_conflicts(table, rows)
+    return {
+        "requested": len(ids) + len(invalid),
+        "assigned": assigned,
+        "already_assigned": len(existing) - assigned,
+        "not_found": invalid + [str(other_id) for other_id in ids if other_id not in existing],
+    }
+
+
+@bp.route('/<role_id>/bulk-assign-permissions', methods=['POST'])
+@permission_required("manage_roles")
+def bulk_assign_permissions_to_role(role_id):
+    """
+    Assign many permissions to one role.
+    Expected payload:
+    {
+        "permission_ids": ["<uuid>", "<uuid>"]
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        if not isinstance(data.get('permission_ids'), list):
+            return jsonify(response(False, "permission_ids must be a list")), 400
+        role = Role.query.get(role_id)
+        if not role:
+            return jsonify(response(False, "Role not found")), 404
+
+        result = bulk_assign(role_permissions, "role_id", role.role_id,
+                             "permission_id", data.get('permission_ids'), Permission.permission_id,
+                             lambda _: bump_authz_version(role_id=role.role_id))
+        invalidate_permissions()
+        return jsonify(response(True, "Permissions assigned to role", result)), 200
+    except SQLAlchemyError as db_err:
+        db.session.rollback()
+        return jsonify(response(False, "Database error occurred", error=str(db_err))), 500
+    except Exception as e:
+        return jsonify(response(False, "Something went wrong", error=str(e))), 500
+
+
+@bp.route('/users/<user_id>/bulk-assign-roles', methods=['POST'])
+@permission_required("manage_roles")
+def bulk_assign_roles_to_user(user_id):
+    """
+    Assign many roles to one user.
+    Expected payload:
+    {
+        "role_ids": ["<uuid>", "<uuid>"]
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        if not isinstance(data.get('role_ids'), list):
+            return jsonify(response(False, "role_ids must be a list")), 400
+        user = User.query.get(user_id)
+        if not user:
+            return jsonify(response(False, "User not found")), 404
+
+        result = bulk_assign(user_roles, "user_id", user.user_id,
+                             "role_id", data.get('role_ids'), Role.role_id,
+                             lambda _: bump_authz_version(user_ids=[user.user_id]))
+        invalidate_permissions(user.user_id)
+        invalidate_identity(user.user_id)
+        return jsonify(response(True, "Roles assigned to user", result)), 200
+    except SQLAlchemyError as db_err:
+        db.session.rollback()
+        return jsonify(response(False, "Database error occurred", error=str(db_err))), 500
+    except Exception as e:
+        return jsonify(response(False, "Something went wrong", error=str(e))), 500
+
+
+@bp.route('/<role_id>/bulk-assign-users', methods=['POST'])
+@permission_required("manage_roles")
+def bulk_assign_role_to_users(role_id):
+    """
+    Assign one role to many users, e.g. when onboarding an organisation.
+    Expected payload:
+    {
+        "user_ids": ["<uuid>", "<uuid>", ...]
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        if not isinstance(data.get('user_ids'), list):
+            return jsonify(response(False, "user_ids must be a list")), 400
+        role = Role.query.get(role_id)
+        if not role:
+            return jsonify(response(False, "Role not found")), 404
+
+        result = bulk_assign(user_roles, "role_id", role.role_id,
+                             "user_id", data.get('user_ids'), User.user_id,
+                             lambda user_ids: bump_authz_version(user_ids=user_ids))
+        invalidate_permissions()
+        invalidate_identity()
+        return jsonify(response(True, "Role assigned to users", result)), 200
+    except SQLAlchemyError as db_err:
+        db.session.rollback()
+        return jsonify(response(False, "Database error occurred", error=str(db_err))), 500
+    except Exception as e:
+        return jsonify(response(False, "Something went wrong", error=str(e))), 500
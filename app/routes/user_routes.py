@@ -1,13 +1,19 @@
+import math
 import uuid
 import json
 import click
 import app.messages as messages
-from extentions import db
+from extentions import db, response_cache
 from flask.cli import with_appcontext
 from marshmallow import ValidationError
 from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
-from app.auth.auth_decorators import permission_required
+from app.auth.auth_decorators import permission_required, get_current_user_id
+from app.auth.identity_cache import get_active_user, invalidate_identity
+from app.conditional import conditional_get, freshness
+from app.auth.password_hasher import HashingQueueFull
+from app.database.replica import use_read_replica
+from app.pagination import InvalidCursor, InvalidFieldset, InvalidPageSize, COUNT_ESTIMATED
 from app.database.models import User, Favorites, Recipe, Role
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import Blueprint, request, jsonify, render_template
@@ -25,6 +31,7 @@ from app.schemas.schema import (UserSchema,
                                 VerifyEmailSchema, 
                                 ResetPasswordSchema,
                                 ChangePasswordSchema) 
+from app.schemas.serializer import fast_dump
 from app.utils import (response, 
                        send_email, 
                        validate_schema,
@@ -35,6 +42,19 @@ from app.utils import (response,
  
 bp = Blueprint("users", __name__, url_prefix="/users")
 
+user_schema = UserSchema()
+favorites_schema = FavoritesSchema()
+
+
+def server_busy(tag):
+    """
+    503 for a request that got no password hashing slot in time.
+    """
+    app.logger.warning(f"[{tag}] Password hashing queue is full")
+    busy = jsonify(response(message=messages.SERVER_BUSY))
+    busy.headers["Retry-After"] = str(max(math.ceil(app.config["PASSWORD_HASH_QUEUE_TIMEOUT"]), 1))
+    return busy, 503
+
 
 @bp.route("/singup", methods=["POST"])
 def create_user():
@@ -50,7 +70,7 @@ def create_user():
     """
     try:
         data = request.get_json()
-        is_valid, result = validate_schema(UserSchema(), data)
+        is_valid, result = validate_schema(user_schema, data)
 
         if not is_valid:
             return jsonify(response(message=messages.VALIDATION_FAILED, error=result)), 400
@@ -59,15 +79,14 @@ def create_user():
             return jsonify(response(False, messages.EMAIL_EXIST)), 400
 
         try:
-            user = create_record(User, result)
+            # nothing is committed until the password is hashed
+            user = User(**result)
             user.hash_password(data.get('password'))
             user.set_verification_code()
             normal_role = Role.query.filter_by(name="user").first()
             if normal_role:
                 user.roles.append(normal_role)
             db.session.add(user)
-            db.session.commit()
-
             send_email(
                 subject="Verify Your Email Address",
                 recipients=[user.email],
@@ -78,10 +97,14 @@ def create_user():
                     'your_name': "Golden Recipe!!"
                 }
             )
+            db.session.commit()
 
-            user_data = UserSchema().dump(user)
+            user_data = fast_dump(user_schema, user)
             return jsonify(
                 response(True, messages.REGISTRAION_SUCCESS, user_data)), 201
+        except HashingQueueFull:
+            db.session.rollback()
+            return server_busy("SIGNUP")
         except Exception as e:
             db.session.rollback()
             return jsonify(response(False, messages.REGISTRATION_FAILED, error=str(e)))
@@ -145,7 +168,7 @@ def resend_verification_code():
             return jsonify(response(False, "User not found")), 404
 
         if datetime.utcnow() > user.verification_code_expiry:
-            user.reset_verification_code()
+            user.set_verification_code()
             send_email(
                 subject="Verify Your Email Address",
                 recipients=[user.email],
@@ -156,6 +179,7 @@ def resend_verification_code():
                     'your_name': "Golden Recipe!!"
                 }
             )
+            db.session.commit()
 
             return jsonify(response(True, "Verification code expired, new code sent to email")), 200
         else:
@@ -180,11 +204,17 @@ def login():
         if not user.check_password(data.get('password')):
             return jsonify(response(message=messages.INVALID_PASSWORD)), 400
 
-        user_data = UserSchema().dump(user)
+        if user.password_needs_rehash():
+            user.hash_password(data.get('password'))
+            db.session.commit()
+
+        user_data = fast_dump(user_schema, user)
         tokens = generate_access_token_and_refresh_token(user.user_id, user.email)
         user_data.update(tokens)
         app.logger.info(f"[LOGIN] Successful login: {user.email}")
         return jsonify(response(True, messages.LOGIN_SUCCESS, user_data)), 200
+    except HashingQueueFull:
+        return server_busy("LOGIN")
     except Exception as e:
         app.logger.error("[LOGIN] Unexpected error occurred", exc_info=True)
         return jsonify(response(message=messages.GENERIC_ERROR, error=str(e))), 500
@@ -214,8 +244,10 @@ def update_user():
             # result['profile_image'] = uploaded_url  
 
         user = update_record(user, result)
-        user_detail = UserSchema().dump(user)
+        user_detail = fast_dump(user_schema, user)
         db.session.commit()
+        invalidate_identity(id)
+        response_cache.invalidate(f"user:{id}")
         return jsonify(response(True, "user data updated", user_detail)), 201
     except Exception as e:
         return jsonify(response(message="somthing went wrong.. ", error=str(e))), 500
@@ -223,16 +255,17 @@ def update_user():
 
 @bp.route("/get-user", methods=["GET"])
 @jwt_required()
+@conditional_get(lambda: [freshness(User, User.user_id == get_current_user_id())], per_user=True)
 def get_user():
     try:
         user_data = json.loads(get_jwt_identity())
         id = user_data.get('user_id')
 
-        user = get_record_by(User, user_id=id, is_deleted = False, is_verified = True)
+        user = get_active_user(id)
         if not user:
             return jsonify(response(False, "user does not exist ")), 400
 
-        user_data = UserSchema().dump(user)
+        user_data = fast_dump(user_schema, user)
         return jsonify(response(True, "user retrived successfully", user_data))
     except Exception as e:
         return jsonify(response(message="somthing went wrong.. ", error=str(e))), 500
@@ -250,6 +283,8 @@ def delete_user():
 
         user.is_deleted = True
         db.session.commit()
+        invalidate_identity(id)
+        response_cache.invalidate(f"user:{id}")
         return jsonify(response(True, "user deleted success")), 201
     except Exception as e:
         return jsonify(response(False, "somthing went wrong.. ", error=str(e)))
@@ -257,17 +292,22 @@ def delete_user():
 
 @bp.route("/get-all-user", methods=["GET"])
 # @jwt_required()
+@use_read_replica
 def get_all_users():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor')
         query = get_all_records(User, is_deleted = False)
-        result = paginated_result(query, UserSchema, page, per_page)
+        result = paginated_result(query, UserSchema, page, per_page, cursor=cursor, count_strategy=COUNT_ESTIMATED,
+                                  fields=request.args.get('fields'), exclude=request.args.get('exclude'))
         response_data = {
             'data': result['data'],
             'meta': result['pagination']
         }
         return jsonify(response(True, "Success", response_data)), 200
+    except (InvalidCursor, InvalidFieldset, InvalidPageSize) as e:
+        return jsonify(response(False, str(e))), 400
     except Exception as e:
          return jsonify(response(False, "Something went wrong", error=str(e))), 500
 
@@ -297,8 +337,11 @@ def change_password():
         
         user.hash_password(data.get('new_password'))
         db.session.commit()
-        user_data = UserSchema().dump(user)
+        invalidate_identity(user_id)
+        user_data = fast_dump(user_schema, user)
         return jsonify(response(True, "password updated success", user_data)), 200
+    except HashingQueueFull:
+        return server_busy("CHANGE_PASSWORD")
     except SQLAlchemyError as db_err:
         db.session.rollback()
         return jsonify(response(False, "Database error occurred", error=str(db_err))), 500
@@ -330,7 +373,6 @@ def forgot_password():
         print(reset_token, "reset_token") 
         user.reset_token = reset_token
         user.reset_token_expiry = datetime.utcnow() + timedelta(minutes=30) 
-        db.session.commit()
 
         reset_link = f"http://localhost:5000/users/reset-password?token={reset_token}"
         send_email(
@@ -344,6 +386,7 @@ def forgot_password():
                     "current_year": datetime.utcnow().year
                 }
         )
+        db.session.commit()
         return jsonify(response(True, "Password reset link has been sent to your email")), 200
 
     except SQLAlchemyError as db_err:
@@ -384,6 +427,9 @@ def reset_password():
 
         return jsonify(response(True, "Password has been reset successfully")), 200
 
+    except HashingQueueFull:
+        return server_busy("RESET_PASSWORD")
+
     except SQLAlchemyError as db_err:
         db.session.rollback()
         return jsonify(response(False, "Database error occurred", error=str(db_err))), 500
@@ -408,9 +454,9 @@ def add_to_favorite():
         if not data:
             return jsonify(response(False, "Invalid input: No data provided")), 400
 
-        schema = FavoritesSchema()
+        schema = favorites_schema
 
-        user = User.query.filter_by(user_id=user_id, is_verified=True, is_deleted=False).first()
+        user = get_active_user(user_id)
         if not user:
             return jsonify(response(False, "User not found or not active")), 404
 
@@ -431,7 +477,7 @@ def add_to_favorite():
         db.session.add(favorites)
         db.session.commit()
 
-        favorite_data = schema.dump(favorites)
+        favorite_data = fast_dump(schema, favorites)
         return jsonify(response(True, "Recipe added to favorites successfully", favorite_data)), 200
 
     except SQLAlchemyError as db_err:
@@ -445,28 +491,39 @@ def add_to_favorite():
 
 @bp.route("/favorites", methods=["GET"])
 @jwt_required()
+@use_read_replica
 def get_favorites():
     """
-    Get all favorite recipes for the authenticated user.
+    Get a page of favorite recipes for the authenticated user.
+    Accepts `page`/`per_page` or `cursor` like the other listings.
     Requires a valid JWT token for authentication.
     """
     try:
         user_data = json.loads(get_jwt_identity())
         user_id = user_data.get('user_id')
 
-        user = User.query.filter_by(user_id=user_id, is_verified=True, is_deleted=False).first()
+        user = get_active_user(user_id)
         if not user:
             return jsonify(response(False, "User not found or not active")), 404
 
-        favorites = Favorites.query.filter_by(user_id=user_id).all()
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 10, type=int)
+        cursor = request.args.get('cursor')
 
-        if not favorites:
-            return jsonify(response(True, "No favorite recipes found", [])), 200
+        query = Favorites.query.filter_by(user_id=user_id)
+        result = paginated_result(query, FavoritesSchema, page, per_page, cursor=cursor,
+                                  fields=request.args.get('fields'), exclude=request.args.get('exclude'))
+        response_data = {
+            'data': result['data'],
+            'meta': result['pagination']
+        }
 
-        schema = FavoritesSchema(many=True)
-        favorites_data = schema.dump(favorites)
+        if not result['data']:
+            return jsonify(response(True, "No favorite recipes found", response_data)), 200
+        return jsonify(response(True, "Favorite recipes fetched successfully", response_data)), 200
 
-        return jsonify(response(True, "Favorite recipes fetched successfully", favorites_data)), 200
+    except (InvalidCursor, InvalidFieldset, InvalidPageSize) as e:
+        return jsonify(response(False, str(e))), 400
 
     except SQLAlchemyError as db_err:
         db.session.rollback()
@@ -515,7 +572,10 @@ def create_admin():
             last_name = last_name,
             is_verified = True
         )
-        user.hash_password(password) 
+        try:
+            user.hash_password(password)
+        except HashingQueueFull:
+            raise click.ClickException(messages.SERVER_BUSY)
         user.roles.append(admin_role)
         db.session.add(user)
         db.session.commit()
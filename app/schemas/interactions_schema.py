@@ -11,4 +11,7 @@ class CommentsSchema(Schema):
 
     # Relationships (optional if you need nested data later)
     user = fields.Nested("UserSchema", dump_only=True) 
-    recipe = fields.Nested("RecipeSchema", exclude=("author",), dump_only=True)
\ No newline at end of file
+    recipe = fields.Nested("RecipeSchema", exclude=("author",), dump_only=True)
+
+    class Meta:
+        load_profile = {"user": "joined", "recipe": "joined"}
@@ -0,0 +1,57 @@
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload, load_only
+
+
+# strategies a schema can name in `Meta.load_profile`
+LOADERS = {
+    "joined": joinedload,
+    "selectin": selectinload,
+}
+DEFAULT_LOADER = "selectin"
+
+
+def _load_profile(schema):
+    return getattr(getattr(schema, "Meta", None), "load_profile", {})
+
+
+def load_options(schema, model):
+    """
+    Loader options that fetch exactly what `schema` dumps for `model` rows:
+    load_only() for dumped columns and an eager loader for every nested
+    relationship, using the strategy named in the schema's Meta.load_profile
+    (selectin by default). Nested schemas are followed recursively.
+    """
+    mapper = inspect(model)
+    profile = _load_profile(schema)
+    columns = set()
+    relationship_options = []
+
+    for name, field in schema.dump_fields.items():
+        key = field.attribute or name
+        if isinstance(field, fields.Nested) and key in mapper.relationships:
+            relationship = mapper.relationships[key]
+            if relationship.lazy == "dynamic":
+                continue
+            # the foreign key is needed to match the related rows
+            columns.update(mapper.get_property_by_column(column).key for column in relationship.local_columns)
+            loader = LOADERS[profile.get(key, DEFAULT_LOADER)](relationship.class_attribute)
+            nested = load_options(field.schema, relationship.mapper.class_)
+            relationship_options.append(loader.options(*nested) if nested else loader)
+        elif key in mapper.column_attrs:
+            columns.add(key)
+
+    options = []
+    if columns:
+        options.append(load_only(*(mapper.column_attrs[key].class_attribute for key in sorted(columns))))
+    return options + relationship_options
+
+
+def eager_load(query, schema):
+    """
+    Apply the load profile of `schema` (a class or instance) to `query`.
+    """
+    if isinstance(schema, type):
+        schema = schema()
+    model = query.column_descriptions[0]["entity"]
+    return query.options(*load_options(schema, model))
@@ -31,13 +31,25 @@ class ChangePasswordSchema(Schema):
     new_password = fields.String(required=True, validate=lambda x: len(x) >= 8,)
 
 
+def validate_category_id(category_id):
+    """
+    Check the category against the in-process registry instead of waiting
+    for the foreign key to fail at commit.
+    """
+    from app.category_registry import category_registry
+    import app.messages as messages
+
+    if not category_registry.exists(category_id):
+        raise ValidationError(messages.CATEGORY_NOT_FOUND)
+
+
 class RecipeSchema(Schema):
     recipe_id = fields.UUID(dump_only=True)  
     title = fields.Str(required=True, validate=validate.Length(max=255))  
     description = fields.Str(allow_none=True) 
     content = fields.Str(required=True) 
     author_id = fields.UUID(required=True, load_only=True)
-    category_id = fields.UUID(required=True, load_only=True)  
+    category_id = fields.UUID(required=True, load_only=True, validate=validate_category_id)  
     created_at = fields.DateTime(dump_only=True) 
     updated_at = fields.DateTime(dump_only=True)  
 
@@ -45,6 +57,10 @@ class RecipeSchema(Schema):
     author = fields.Nested("UserSchema", dump_only=True) 
     # category = fields.Nested("UserSchema", dump_only=True) 
 
+    class Meta:
+        # eager loaders used by app.schemas.load_profile when dumping lists
+        load_profile = {"author": "joined"}
+
 class FavoritesSchema(Schema):
     id = fields.UUID(dump_only=True)  
     recipe_id = fields.UUID(required=True, load_only=True)
@@ -56,6 +72,9 @@ class FavoritesSchema(Schema):
     user = fields.Nested("UserSchema", dump_only=True) 
     recipe = fields.Nested("RecipeSchema", exclude=("author",), dump_only=True)
 
+    class Meta:
+        load_profile = {"user": "joined", "recipe": "joined"}
+
 class LoginSchema(Schema):
     email = fields.Email(required=True)
     password = fields.Str(required=True, validate=validate.Length(min=8))
@@ -0,0 +1,152 @@
+import threading
+from marshmallow import fields, missing
+from marshmallow.decorators import PRE_DUMP, POST_DUMP
+from config import Config
+from app.cache import TTLCache
+
+
+# `?fields=`/`?exclude=` reach both caches, so they are LRU bounded;
+# entries never expire on their own
+_serializers = TTLCache(maxsize=Config.SCHEMA_CACHE_SIZE, ttl=float("inf"))
+_schemas = TTLCache(maxsize=Config.SCHEMA_CACHE_SIZE, ttl=float("inf"))
+# reentrant: compiling a schema compiles its nested schemas
+_lock = threading.RLock()
+
+
+def _inline_expression(field, native=False):
+    """
+    Inline dump expression for `field` with the attribute value in `{v}` and
+    the field itself in `{f}`, or None if the field must serialize itself.
+    With `native`, UUIDs and ISO datetimes are left for the JSON provider
+    to encode.
+    """
+    if isinstance(field, fields.Nested):
+        return None
+    if isinstance(field, fields.DateTime):
+        # covers Date, Time and the naive/aware variants
+        if (field.format or field.DEFAULT_FORMAT) in ("iso", "iso8601"):
+            return "{v}" if native else "{v}.isoformat()"
+        return None
+    if isinstance(field, fields.UUID) and native:
+        return "{v}"
+    if isinstance(field, fields.String):
+        # covers UUID, Email and Url
+        return "str({v})"
+    if isinstance(field, fields.Boolean):
+        return "{v} if {v}.__class__ is bool else {f}._serialize({v}, None, None)"
+    if type(field) is fields.Integer and not field.as_string:
+        return "int({v})"
+    return None
+
+
+def compile_serializer(schema, native=False):
+    """
+    Generate a function that dumps one object the way `schema.dump` does.
+    UUID, datetime, string, bool and int fields become inline expressions,
+    nested schemas call their own compiled serializer, and any other field
+    falls back to its own `serialize`.
+    Schemas with pre_dump/post_dump hooks are dumped by marshmallow.
+    `native` output is only valid JSON input for a provider with
+    `native_types` (see app.json_provider).
+    """
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+        return lambda obj: schema.dump(obj, many=False)
+
+    namespace = {"missing": missing, "get_attribute": schema.get_attribute}
+    body = []
+    items = []
+    fallbacks = []
+
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        attribute = field.attribute or name
+        key = field.data_key or name
+
+        if isinstance(field, fields.Nested) and attribute.isidentifier():
+            namespace[f"nested{index}"] = get_serializer(field.schema, native)
+            body.append(f"    v{index} = obj.{attribute}")
+            if field.many:
+                value = f"[nested{index}(item) for item in v{index}]"
+            else:
+                value = f"nested{index}(v{index})"
+            items.append(f"        {key!r}: None if v{index} is None else {value},")
+            continue
+
+        expression = _inline_expression(field, native)
+        if expression is None or not attribute.isidentifier():
+            namespace[f"field{index}"] = field
+            fallbacks.append(
+                f"    value = field{index}.serialize({name!r}, obj, accessor=get_attribute)\n"
+                f"    if value is not missing:\n"
+                f"        data[{key!r}] = value"
+            )
+            continue
+
+        body.append(f"    v{index} = obj.{attribute}")
+        namespace[f"field{index}"] = field
+        value = expression.format(v=f"v{index}", f=f"field{index}")
+        items.append(f"        {key!r}: None if v{index} is None else {value},")
+
+    source = "\n".join(
+        ["def serialize(obj):"]
+        + body
+        + ["    data = {"]
+        + items
+        + ["    }"]
+        + fallbacks
+        + ["    return data"]
+    )
+    exec(compile(source, f"<serializer {type(schema).__name__}>", "exec"), namespace)
+    serialize = namespace["serialize"]
+    serialize.source = source
+    return serialize
+
+
+def _cache_key(schema, native):
+    only = frozenset(schema.only) if schema.only is not None else None
+    return type(schema), only, frozenset(schema.exclude), native
+
+
+def get_serializer(schema, native=False):
+    """
+    Compiled serializer for `schema`, shared by every schema instance with
+    the same class and only/exclude field set.
+    """
+    key = _cache_key(schema, native)
+    serializer = _serializers.get(key)
+    if serializer is None:
+        with _lock:
+            serializer = _serializers.get(key)
+            if serializer is None:
+                serializer = compile_serializer(schema, native)
+                _serializers.set(key, serializer)
+    return serializer
+
+
+def get_schema(schema_class, **kwargs):
+    """
+    Shared instance of `schema_class` for the given options, so routes do
+    not build a new schema on every request.
+    """
+    key = (schema_class, tuple(sorted(
+        (name, frozenset(value) if isinstance(value, (list, set, tuple)) else value)
+        for name, value in kwargs.items()
+    )))
+    schema = _schemas.get(key)
+    if schema is None:
+        with _lock:
+            schema = _schemas.get(key)
+            if schema is None:
+                schema = schema_class(**kwargs)
+                _schemas.set(key, schema)
+    return schema
+
+
+def fast_dump(schema, obj, many=None, native=False):
+    """
+    Drop-in replacement for `schema.dump(obj, many=many)`.
+    """
+    serialize = get_serializer(schema, native)
+    many = schema.many if many is None else many
+    if many:
+        return [serialize(item) for item in obj]
+    return serialize(obj)
@@ -0,0 +1,202 @@
+import time
+import socket
+import smtplib
+import threading
+from collections import deque
+from contextlib import contextmanager
+from config import Config
+
+
+# errors that leave the session unusable; any other SMTPException (refused
+# sender or recipients, rejected data) concerns one message only, and
+# smtplib resets the session after it
+SESSION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError, socket.timeout)
+
+
+class PooledConnection:
+    """
+    An open Flask-Mail connection plus the bookkeeping the pool needs.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_checked = self.created_at
+        self.messages_sent = 0
+
+
+class SMTPConnectionPool:
+    """
+    Keeps authenticated SMTP sessions open between sends so that TLS and
+    login are paid once per connection instead of once per message.
+    Connections are recycled after `max_messages` messages or when idle
+    longer than `idle_timeout`, and probed with NOOP before reuse once
+    they have been idle for `health_check_interval` seconds.
+    """
+
+    def __init__(self, size, max_messages, idle_timeout, health_check_interval):
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._started_at = None
+        self.handshakes = 0
+        self.messages_sent = 0
+        self.failures = 0
+        self.discarded = 0
+
+    def _open(self):
+        from extentions import mail
+
+        connection = mail.connect()
+        connection.__enter__()
+        with self._lock:
+            self.handshakes += 1
+        return PooledConnection(connection)
+
+    def _close(self, pooled):
+        host = pooled.connection.host
+        if host is None:
+            return
+        try:
+            host.quit()
+        except (smtplib.SMTPException, OSError):
+            host.close()
+
+    def _is_usable(self, pooled):
+        now = time.monotonic()
+        if pooled.messages_sent >= self.max_messages:
+            return False
+        if now - pooled.last_used > self.idle_timeout:
+            return False
+
+        host = pooled.connection.host
+        if host is None or now - pooled.last_checked < self.health_check_interval:
+            return True
+        try:
+            pooled.last_checked = now
+            return host.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                pooled = self._idle.popleft() if self._idle else None
+            if pooled is None:
+                return self._open()
+            if self._is_usable(pooled):
+                return pooled
+            with self._lock:
+                self.discarded += 1
+            self._close(pooled)
+
+    def _checkin(self, pooled, broken=False):
+        if broken or pooled.messages_sent >= self.max_messages:
+            self._close(pooled)
+            return
+        pooled.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(pooled)
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection from the pool, blocking while all are in use.
+        """
+        self._slots.acquire()
+        pooled = None
+        broken = False
+        try:
+            pooled = self._checkout()
+            yield pooled
+        except SESSION_ERRORS:
+            broken = True
+            raise
+        finally:
+            if pooled is not None:
+                self._checkin(pooled, broken)
+            self._slots.release()
+
+    def _send_one(self, pooled, message):
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        pooled.connection.send(message)
+        pooled.messages_sent += 1
+        with self._lock:
+            self.messages_sent += 1
+
+    def _count_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def send(self, message):
+        with self.connection() as pooled:
+            try:
+                self._send_one(pooled, message)
+            except Exception:
+                self._count_failure()
+                raise
+
+    def send_batch(self, messages):
+        """
+        Send many messages over as few sessions as possible.
+        Returns a list aligned with `messages`: None for a delivered message,
+        otherwise the exception raised while sending it.
+        """
+        results = []
+        pending = list(messages)
+        while pending:
+            try:
+                with self.connection() as pooled:
+                    while pending:
+                        if pooled.messages_sent >= self.max_messages:
+                            break
+                        message = pending[0]
+                        try:
+                            self._send_one(pooled, message)
+                            results.append(None)
+                        except SESSION_ERRORS:
+                            raise
+                        except Exception as e:
+                            # e.g. SMTPRecipientsRefused: the session stays usable
+                            self._count_failure()
+                            results.append(e)
+                        pending.pop(0)
+            except SESSION_ERRORS as e:
+                # the session died mid-batch: fail the current message, retry the rest on a new one
+                self._count_failure()
+                results.append(e)
+                pending.pop(0)
+        return results
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self):
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "handshakes": self.handshakes,
+            "messages_sent": self.messages_sent,
+            "failures": self.failures,
+            "discarded": self.discarded,
+            "messages_per_handshake": round(self.messages_sent / self.handshakes, 2) if self.handshakes else 0,
+            "messages_per_sec": round(self.messages_sent / elapsed, 2) if elapsed else 0,
+        }
+
+
+smtp_pool = SMTPConnectionPool(
+    size=Config.MAIL_POOL_SIZE,
+    max_messages=Config.MAIL_POOL_MAX_MESSAGES,
+    idle_timeout=Config.MAIL_POOL_IDLE_TIMEOUT,
+    health_check_interval=Config.MAIL_POOL_HEALTH_CHECK_INTERVAL,
+)
@@ -1,8 +1,11 @@
 import json
+import uuid
+from decimal import Decimal
+from datetime import date
 from config import Config
 from flask_mail import Message
 from marshmallow import ValidationError
-from flask import jsonify, render_template
+from flask import jsonify, render_template, current_app
 from email_validator import validate_email, EmailNotValidError
 from flask_jwt_extended import create_access_token, create_refresh_token
 
@@ -36,13 +39,18 @@ def is_valid_email(email):
 
 def generate_access_token_and_refresh_token(user_id, email):
     identity = json.dumps({"user_id": str(user_id), "email": email})
+    access_claims = {
+        "issuer_id": Config.JWT_ISSUER,
+        "secret_key": Config.JWT_SECRET_KEY
+    }
+    if Config.JWT_EMBED_AUTHZ_CLAIMS:
+        from app.auth.permission_cache import build_authz_claim
+        access_claims["authz"] = build_authz_claim(user_id)
+
     tokens = {
         "access_token": create_access_token(
             identity=identity,
-            additional_claims={
-                "issuer_id": Config.JWT_ISSUER,
-                "secret_key": Config.JWT_SECRET_KEY
-            }),
+            additional_claims=access_claims),
         "refresh_token": create_refresh_token(
             identity=identity,
             additional_claims={
@@ -55,39 +63,69 @@ def generate_access_token_and_refresh_token(user_id, email):
 
 def send_verification_email(user):
     """
-    Send a verification email with a code.
+    Queue a verification email with a code.
     """
-    from extentions import mail
+    return send_email(
+        subject="Verify Your Email Address",
+        recipients=[user.email],
+        template_name='verification_email.html',
+        context={
+            'user': user,
+            'verification_code': user.verification_code,
+            'your_name': "Golden Recipe!!"
+        }
+    )
 
-    try:
-        html_body = render_template('verification_email.html',
-            user=user,  
-            verification_code=user.verification_code,
-            your_name = "Golden Recipe!!"
-        )
 
-        msg = Message("Verify Your Email Address",
-            recipients=[user.email],
-            html=html_body  
-        )
-        mail.send(msg)
-    except Exception as e:
-        print(f"Error sending email: {e}")
-        return jsonify({"error": "Failed to send email"}), 500
-
-
-def paginated_result(query, model_schema, page=1, per_page=10):
+def paginated_result(query, model_schema, page=1, per_page=10, cursor=None, count_strategy="exact",
+                     fields=None, exclude=None):
 
     """
     Function to handle pagination of a SQLAlchemy query.
+    Pass `cursor` (an empty string for the first page) to use keyset
+    pagination instead of page numbers.
+    `count_strategy` is one of "exact", "cached" or "estimated"; the
+    `total_is_exact` flag in the metadata tells clients which one they got.
+    Rows are fetched with the load profile of `model_schema`.
+    `fields`/`exclude` are the raw `?fields=`/`?exclude=` values; they trim
+    both the response and the columns selected from the database.
     """
-    paginated_query = query.paginate(page=page, per_page=per_page, error_out=False)  
-    data = model_schema(many=True).dump(paginated_query.items)
+    from app.pagination import count_total, keyset_page, page_size, parse_fieldset, InvalidFieldset
+    from app.schemas.load_profile import eager_load
+    from app.schemas.serializer import fast_dump, get_schema
+
+    per_page = page_size(per_page)
+    only, excluded = parse_fieldset(fields), parse_fieldset(exclude) or ()
+    try:
+        schema = get_schema(model_schema, many=True, only=only, exclude=excluded)
+    except ValueError as e:
+        raise InvalidFieldset(f"Invalid fields/exclude selection: {', '.join((only or ()) + excluded)}") from e
+    # let the JSON provider encode UUIDs and datetimes itself
+    native = getattr(current_app.json, "native_types", False)
+    items_query = eager_load(query, schema)
+
+    if cursor is not None:
+        items, next_cursor, prev_cursor = keyset_page(items_query, per_page, cursor)
+        return {
+            'data': fast_dump(schema, items, native=native),
+            'pagination': {
+                'mode': 'cursor',
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'prev_cursor': prev_cursor,
+            }
+        }
+
+    paginated_query = items_query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+    total, total_is_exact = count_total(query, count_strategy)
+    data = fast_dump(schema, paginated_query.items, native=native)
     pagination_metadata = {
-        'total': paginated_query.total,     
+        'total': total,
+        'total_is_exact': total_is_exact,
+        'count_strategy': count_strategy,
         'page': paginated_query.page,       
         'per_page': paginated_query.per_page,
-        'pages': paginated_query.pages,     
+        'pages': -(-total // paginated_query.per_page) if total else 0,
     }
     return {
         'data': data,
@@ -95,26 +133,76 @@ def paginated_result(query, model_schema, page=1, per_page=10):
     }
 
 
+# never copied from model instances into the outbox
+EMAIL_CONTEXT_EXCLUDED_FIELDS = {
+    "password",
+    "reset_token",
+    "reset_token_expiry",
+    "verification_code",
+    "verification_code_expiry",
+}
+
+
+def serialize_email_context(value):
+    """
+    Convert a template context into JSON-safe data.
+    Model instances become dicts of their columns, which templates
+    read the same way (`user.first_name`).
+    """
+    if hasattr(value, "__table__"):
+        return {
+            column.key: serialize_email_context(getattr(value, column.key))
+            for column in value.__table__.columns
+            if column.key not in EMAIL_CONTEXT_EXCLUDED_FIELDS
+        }
+    if hasattr(value, "_asdict"):
+        # read-only snapshots, e.g. app.auth.identity_cache.UserSnapshot
+        return serialize_email_context(value._asdict())
+    if isinstance(value, dict):
+        return {key: serialize_email_context(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [serialize_email_context(item) for item in value]
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    return value
+
+
 def send_email(subject, recipients, template_name, context):
     """
-    General function to send HTML emails using Flask-Mail.
-    
+    Queue an HTML email in the outbox.
+    The row joins the caller's transaction and is delivered by
+    `flask mail-worker` once the caller commits.
+
     :param subject: Subject of the email
     :param recipients: List of recipient email addresses
     :param template_name: Name of the HTML template
     :param context: Dictionary with template variables
-    :return: Flask response or None
+    :return: EmailOutbox instance
     """
-    from extentions import mail
-    try:
-        print(context, "context")
-        html_body = render_template(template_name, **context)
-        msg = Message(subject, recipients=recipients, html=html_body)
-        mail.send(msg)
-    except Exception as e:
-        print(f"Error sending email: {e}")
-        return jsonify({"error": "Failed to send email"}), 500
-    
+    from extentions import db
+    from app.database.models import EmailOutbox
+
+    email = EmailOutbox(
+        subject=subject,
+        recipients=list(recipients),
+        template_name=template_name,
+        context=serialize_email_context(context)
+    )
+    db.session.add(email)
+    return email
+
+
+def build_email_message(subject, recipients, template_name, context):
+    """
+    Render an email, with its plain-text alternative, into a Flask-Mail message.
+    """
+    from extentions import email_renderer
+
+    html_body, text_body = email_renderer.render(template_name, context)
+    return Message(subject, recipients=recipients, html=html_body, body=text_body)
+
 
 def validate_schema(schema, data, partial=False):
     """
@@ -4,18 +4,116 @@ from datetime import timedelta
 from dotenv import load_dotenv
 load_dotenv()
 
+
+def engine_options(database_uri):
+    """
+    SQLAlchemy engine options read from the environment.
+    """
+    if not database_uri or database_uri.startswith("sqlite"):
+        return {}
+
+    options = {
+        "pool_size": int(os.getenv('DB_POOL_SIZE', 10)),
+        "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        "pool_timeout": float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        "pool_recycle": int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        "pool_pre_ping": os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+    statement_timeout = os.getenv('DB_STATEMENT_TIMEOUT_MS')
+    if statement_timeout and database_uri.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout)}"}
+    return options
+
+
+def replica_uris():
+    return [uri.strip() for uri in os.getenv('DATABASE_REPLICA_URIS', '').split(',') if uri.strip()]
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URI")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = {f"replica_{index}": uri for index, uri in enumerate(replica_uris())}
+    REPLICA_BIND_KEYS = list(SQLALCHEMY_BINDS)
+    # round_robin or least_connections
+    REPLICA_SELECTION = os.getenv('REPLICA_SELECTION', 'round_robin')
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
     SECRET_KEY = os.getenv("SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=5)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=10)
     JWT_SECRET_KEY = os.getenv("SECRET_KEY")
     JWT_ISSUER = os.getenv('JWT_ISSUER')
     MAIL_SERVER = os.getenv('MAIL_SERVER')
-    MAIL_PORT = os.getenv('MAIL_PORT')
-    MAIL_USE_TLS = os.getenv('MAIL_USE_TLS')
+    MAIL_PORT = int(os.getenv('MAIL_PORT', 25))
+    MAIL_USE_TLS = os.getenv('MAIL_USE_TLS', 'false').lower() == 'true'
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER')
+    MAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('MAIL_OUTBOX_MAX_ATTEMPTS', 8))
+    MAIL_OUTBOX_BACKOFF_BASE = int(os.getenv('MAIL_OUTBOX_BACKOFF_BASE', 30))
+    MAIL_OUTBOX_BACKOFF_MAX = int(os.getenv('MAIL_OUTBOX_BACKOFF_MAX', 3600))
+    MAIL_WORKER_THREADS = int(os.getenv('MAIL_WORKER_THREADS', 2))
+    MAIL_WORKER_BATCH_SIZE = int(os.getenv('MAIL_WORKER_BATCH_SIZE', 20))
+    MAIL_WORKER_POLL_INTERVAL = float(os.getenv('MAIL_WORKER_POLL_INTERVAL', 2))
+    EMAIL_TEMPLATES = ['verification_email.html', 'thankyou.html', 'reset_password_email.html']
+    MAIL_POOL_SIZE = int(os.getenv('MAIL_POOL_SIZE', 4))
+    MAIL_POOL_MAX_MESSAGES = int(os.getenv('MAIL_POOL_MAX_MESSAGES', 100))
+    MAIL_POOL_IDLE_TIMEOUT = float(os.getenv('MAIL_POOL_IDLE_TIMEOUT', 60))
+    MAIL_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv('MAIL_POOL_HEALTH_CHECK_INTERVAL', 15))
+    SQL_STATS_ENABLED = os.getenv('SQL_STATS_ENABLED', 'true').lower() == 'true'
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 5))
+    SQL_SLOW_QUERY_MS = int(os.getenv('SQL_SLOW_QUERY_MS', 200))
+    # slowest statements kept per request for the slow-query warning
+    SQL_SLOW_QUERY_TOP = int(os.getenv('SQL_SLOW_QUERY_TOP', 5))
+    # X-DB-Queries / X-DB-Time response headers; always on in debug mode
+    SQL_STATS_HEADERS = os.getenv('SQL_STATS_HEADERS', 'false').lower() == 'true'
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 1000))
+    BULK_COPY_THRESHOLD = int(os.getenv('BULK_COPY_THRESHOLD', 10000))
+    PERMISSION_CACHE_TTL = int(os.getenv('PERMISSION_CACHE_TTL', 60))
+    PERMISSION_CACHE_SIZE = int(os.getenv('PERMISSION_CACHE_SIZE', 10000))
+    # tokens carry the user's roles and permissions; a role change revokes
+    # them at once in the process that made it, while other processes keep
+    # accepting them until their cached authz_version expires, i.e. for up
+    # to AUTHZ_VERSION_CACHE_TTL seconds
+    JWT_EMBED_AUTHZ_CLAIMS = os.getenv('JWT_EMBED_AUTHZ_CLAIMS', 'false').lower() == 'true'
+    AUTHZ_VERSION_CACHE_TTL = int(os.getenv('AUTHZ_VERSION_CACHE_TTL', 30))
+    # full werkzeug method string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:1000000"
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # 0 hashes on the request thread
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 4 * (os.cpu_count() or 1)))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', 5))
 
+    # shared schema instances and compiled serializers kept per only/exclude set
+    SCHEMA_CACHE_SIZE = int(os.getenv('SCHEMA_CACHE_SIZE', 256))
+    # larger ?per_page= values are capped to this
+    PAGINATION_MAX_PER_PAGE = int(os.getenv('PAGINATION_MAX_PER_PAGE', 100))
+    PAGINATION_COUNT_CACHE_TTL = int(os.getenv('PAGINATION_COUNT_CACHE_TTL', 60))
+    PAGINATION_COUNT_CACHE_SIZE = int(os.getenv('PAGINATION_COUNT_CACHE_SIZE', 1024))
+    # estimates below this are replaced by an exact count
+    PAGINATION_EXACT_COUNT_BELOW = int(os.getenv('PAGINATION_EXACT_COUNT_BELOW', 1000))
+    # "auto" uses orjson when installed, otherwise "stdlib"
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))
+    # comma separated; unset keeps app.compression.DEFAULT_MIMETYPES
+    COMPRESS_MIMETYPES = [mimetype.strip() for mimetype in os.getenv('COMPRESS_MIMETYPES', '').split(',')
+                          if mimetype.strip()] or None
+    STATIC_CACHE_MAX_AGE = int(os.getenv('STATIC_CACHE_MAX_AGE', 86400))
+    # "memory" (per process), "redis" or "none"
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_REDIS_URL = os.getenv('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    RESPONSE_CACHE_PREFIX = os.getenv('RESPONSE_CACHE_PREFIX', 'response-cache:')
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 30))
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 1024))
+    CATEGORY_REGISTRY_CHECK_INTERVAL = float(os.getenv('CATEGORY_REGISTRY_CHECK_INTERVAL', 5))
+    CATEGORY_REGISTRY_PRELOAD = os.getenv('CATEGORY_REGISTRY_PRELOAD', 'true').lower() == 'true'
+    # read-only user snapshots shared across requests; invalidated on writes
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 30))
+    IDENTITY_CACHE_SIZE = int(os.getenv('IDENTITY_CACHE_SIZE', 4096))
+    # rows fetched per round trip, and per streamed chunk, by file exports
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    # xlsx exports larger than this are spooled to a temporary file
+    EXPORT_SPOOL_MAX_SIZE = int(os.getenv('EXPORT_SPOOL_MAX_SIZE', 16 * 1024 * 1024))
@@ -3,15 +3,24 @@ from flask_migrate import Migrate
 from flask_marshmallow import Marshmallow
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail
+from app.email_renderer import EmailRenderer
+from app.database.replica import RoutingSession, replica_router
+from app.database.query_stats import SQLInstrumentation
+from app.compression import ResponseCompression
+from app.response_cache import ResponseCache
 
 from app.utils import response
 from flask import jsonify
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 ma = Marshmallow()
 jwt = JWTManager()
 mail = Mail()
+email_renderer = EmailRenderer()
+sql_instrumentation = SQLInstrumentation()
+response_compression = ResponseCompression()
+response_cache = ResponseCache()
 
 """
 Custom error handling for JWT
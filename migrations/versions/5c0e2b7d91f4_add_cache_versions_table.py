@@ -0,0 +1,30 @@
+"""Add cache_versions table
+
+Revision ID: 5c0e2b7d91f4
+Revises: a41c7e95d3b8
+Create Date: 2026-10-18 19:05:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0e2b7d91f4'
+down_revision = 'a41c7e95d3b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cache_versions = op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(cache_versions, [{'name': 'recipe_categories', 'version': 0}])
+
+
+def downgrade():
+    op.drop_table('cache_versions')
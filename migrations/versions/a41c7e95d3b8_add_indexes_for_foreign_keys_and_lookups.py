@@ -0,0 +1,56 @@
+"""Add indexes for foreign keys and lookups
+
+Revision ID: a41c7e95d3b8
+Revises: 8b1e4d7c9a20
+Create Date: 2026-10-18 12:20:05.117342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41c7e95d3b8'
+down_revision = '8b1e4d7c9a20'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, unique, partial WHERE clause)
+INDEXES = [
+    ('ix_user_active_created_at', 'user', ['created_at', 'user_id'], False, 'is_deleted = false'),
+    ('ix_user_reset_token', 'user', ['reset_token'], False, 'reset_token IS NOT NULL'),
+    ('ix_recipes_author_id_created_at', 'recipes', ['author_id', 'created_at', 'recipe_id'], False, None),
+    ('ix_recipes_category_id', 'recipes', ['category_id'], False, None),
+    ('ix_favorites_user_id_recipe_id', 'favorites', ['user_id', 'recipe_id'], True, None),
+    ('ix_favorites_recipe_id', 'favorites', ['recipe_id'], False, None),
+    ('ix_comments_recipe_id_created_at', 'comments', ['recipe_id', 'created_at'], False, None),
+    ('ix_comments_user_id', 'comments', ['user_id'], False, None),
+    ('ix_user_roles_role_id', 'user_roles', ['role_id'], False, None),
+    ('ix_role_permissions_permission_id', 'role_permissions', ['permission_id'], False, None),
+]
+
+
+def upgrade():
+    # the unique favorites index cannot be built while duplicates exist
+    op.execute(
+        "DELETE FROM favorites a USING favorites b "
+        "WHERE a.user_id = b.user_id AND a.recipe_id = b.recipe_id AND a.ctid > b.ctid"
+    )
+
+    # CONCURRENTLY keeps the tables writable but cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=unique,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -5,27 +5,44 @@ from flask import Flask
 from flask_cors import CORS
 from datetime import datetime
 from app.routes.user_routes import create_admin
+from app.mail_outbox import mail_worker
 from logging.handlers import RotatingFileHandler
-from extentions import db, migrate, ma, jwt, mail
+from extentions import (db, migrate, ma, jwt, mail, email_renderer, replica_router, sql_instrumentation,
+                        response_compression, response_cache)
 from flask_swagger_ui import get_swaggerui_blueprint
+from app.database.pool_metrics import configure_engine_options
+from app.json_provider import init_json_provider
+from app.compression import serve_precompressed
+from app.category_registry import category_registry
 from app.routes import (user_routes, 
                         recipe_routes, 
                         interactions_routes, 
                         role_routes, 
-                        permission_routes)
+                        permission_routes,
+                        internal_routes)
 
 def create_app():
     app = Flask(__name__, template_folder='templates')
     app.config.from_object("config.Config")
+    configure_engine_options(app)
+    init_json_provider(app)
+    # after_request hooks run in reverse order: compress last
+    response_compression.init_app(app)
 
     db.init_app(app)
+    replica_router.init_app(app)
+    sql_instrumentation.init_app(app)
     migrate.init_app(app, db)
     ma.init_app(app)
     jwt.init_app(app)
     mail.init_app(app)
+    email_renderer.init_app(app)
+    response_cache.init_app(app)
+    category_registry.init_app(app)
     CORS(app, origins="*")
 
     app.cli.add_command(create_admin)
+    app.cli.add_command(mail_worker)
 
     # ✅ Setup Swagger UI
     SWAGGER_URL = '/api/docs'
@@ -39,11 +56,14 @@ def create_app():
     )
 
     app.register_blueprint(swaggerui_blueprint)
+    serve_precompressed(app, "/static/swagger.json", os.path.join(app.static_folder, "swagger.json"),
+                        "application/json", endpoint="swagger_json")
     app.register_blueprint(user_routes.bp)
     app.register_blueprint(recipe_routes.bp)
     app.register_blueprint(interactions_routes.bp)
     app.register_blueprint(role_routes.bp)
     app.register_blueprint(permission_routes.bp)
+    app.register_blueprint(internal_routes.bp)
 
     
     setup_logging(app)
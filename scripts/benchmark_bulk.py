@@ -0,0 +1,81 @@
+"""
+Rows per second of the app.db_driver write helpers on recipe_categories
+in the database in DATABASE_URI: create_multiple_records (ORM add_all, the
+previous path) against bulk_insert (COPY on PostgreSQL from
+BULK_COPY_THRESHOLD rows), bulk_update and bulk_upsert. Rows added by the
+benchmark are deleted afterwards.
+
+    python scripts/benchmark_bulk.py --sizes 1000 100000 1000000
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    # ORM instances for a million rows take several GB
+    parser.add_argument("--orm-max", type=int, default=100000, help="skip the ORM baseline above this size")
+    args = parser.parse_args()
+
+    from run import app
+    from extentions import db
+    from app.database.models import RecipeCategories
+    from app.db_driver import create_multiple_records, bulk_insert, bulk_update, bulk_upsert
+
+    prefix = f"bench-{uuid.uuid4().hex[:8]}-"
+
+    def cleanup():
+        db.session.query(RecipeCategories).filter(RecipeCategories.category_name.startswith(prefix)) \
+            .delete(synchronize_session=False)
+        db.session.commit()
+        db.session.remove()
+
+    with app.app_context():
+        dialect = db.session.get_bind().dialect.name
+        print(f"dialect: {dialect}")
+        print(f"{'rows':>9} {'helper':<24} {'time':>9} {'rows/s':>10}")
+        try:
+            for size in args.sizes:
+                rows = [{"category_name": f"{prefix}{i}"} for i in range(size)]
+                results = []
+
+                if size <= args.orm_max:
+                    results.append(("create_multiple_records", timed(lambda: create_multiple_records(RecipeCategories, rows))))
+                    cleanup()
+
+                inserted = []
+                results.append(("bulk_insert", timed(lambda: inserted.extend(bulk_insert(RecipeCategories, rows)))))
+                updates = [{"category_id": row["category_id"], "category_name": f"{prefix}u{i}"}
+                           for i, row in enumerate(inserted)]
+                results.append(("bulk_update", timed(lambda: bulk_update(RecipeCategories, updates))))
+
+                if dialect == "postgresql":
+                    # half existing rows, half new ones
+                    upserts = [{"category_id": row["category_id"], "category_name": f"{prefix}v{i}"}
+                               for i, row in enumerate(inserted[:size // 2])]
+                    upserts += [{"category_id": uuid.uuid4(), "category_name": f"{prefix}n{i}"}
+                                for i in range(size - len(upserts))]
+                    results.append(("bulk_upsert", timed(
+                        lambda: bulk_upsert(RecipeCategories, upserts, key=["category_id"]))))
+                cleanup()
+
+                for name, elapsed in results:
+                    print(f"{size:>9} {name:<24} {elapsed:8.2f}s {size / elapsed:10.0f}")
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Render --count verification emails: render_template per send (the previous
+behaviour, HTML only), the same plus an html_to_text alternative, and the
+precompiled EmailRenderer producing both bodies. No database is needed.
+
+    python scripts/benchmark_email_render.py --count 100000
+"""
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, render_template
+from app.email_renderer import EmailRenderer, html_to_text
+
+TEMPLATE = "verification_email.html"
+
+
+def contexts(count):
+    for index in range(count):
+        yield {
+            "user": {"first_name": f"first{index}", "last_name": f"last{index}"},
+            "verification_code": f"{index % 1000000:06d}",
+            "your_name": "Golden Recipe!!",
+        }
+
+
+def timed(count, render):
+    start = time.perf_counter()
+    for context in contexts(count):
+        render(context)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    app = Flask(__name__, template_folder=os.path.join(ROOT, "templates"))
+    app.config["EMAIL_TEMPLATES"] = [TEMPLATE]
+    renderer = EmailRenderer(app)
+
+    with app.app_context():
+        sample = next(contexts(1))
+        if renderer.render(TEMPLATE, sample)[0] != render_template(TEMPLATE, **sample):
+            sys.exit("precompiled output differs from render_template")
+
+        modes = (
+            ("render_template", lambda context: render_template(TEMPLATE, **context)),
+            ("+ html_to_text", lambda context: html_to_text(render_template(TEMPLATE, **context))),
+            ("EmailRenderer", lambda context: renderer.render(TEMPLATE, context)),
+        )
+        print(f"emails: {args.count}")
+        print(f"{'mode':<16} {'total':>9} {'per email':>11} {'emails/s':>10}")
+        for name, render in modes:
+            elapsed = timed(args.count, render)
+            print(f"{name:<16} {elapsed:8.2f}s {elapsed / args.count * 1e6:9.1f}us {args.count / elapsed:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Peak RSS and time to first byte of /recipe/download-recipes?format=csv
+against the previous pandas export, on the database in DATABASE_URI.
+Missing rows are seeded first; each mode runs in a fresh process.
+
+    python scripts/benchmark_export.py --rows 1000000
+"""
+import io
+import os
+import sys
+import json
+import time
+import uuid
+import resource
+import argparse
+import subprocess
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def peak_rss_mb():
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(app, rows, batch_size=10000):
+    from extentions import db
+    from app.database.models import User, Recipe, RecipeCategories
+
+    with app.app_context():
+        missing = rows - db.session.query(Recipe).count()
+        if missing <= 0:
+            return
+        author = User(first_name="bench", last_name="export", email=f"{uuid.uuid4().hex}@bench.example",
+                      password="x", is_verified=True)
+        category = RecipeCategories(category_name=f"bench-{uuid.uuid4().hex[:8]}")
+        db.session.add_all([author, category])
+        db.session.flush()
+        now = datetime.utcnow()
+        for start in range(0, missing, batch_size):
+            db.session.execute(db.insert(Recipe), [
+                {"recipe_id": uuid.uuid4(), "author_id": author.user_id, "category_id": category.category_id,
+                 "title": f"Recipe {i}", "description": "A recipe", "content": "Mix everything. " * 10,
+                 "created_at": now - timedelta(seconds=i), "updated_at": now}
+                for i in range(start, min(start + batch_size, missing))
+            ])
+            db.session.commit()
+
+
+def run_pandas(app):
+    """
+    The export as it was before streaming: load everything, then write.
+    """
+    import pandas as pd
+    from app.database.models import Recipe
+
+    start = time.perf_counter()
+    with app.app_context():
+        df = pd.DataFrame([{
+            "recipe_id": recipe.recipe_id,
+            "author_id": recipe.author_id,
+            "title": recipe.title,
+            "description": recipe.description,
+            "content": recipe.content,
+            "created_at": recipe.created_at,
+            "updated_at": recipe.updated_at
+        } for recipe in Recipe.query.all()])
+        output = io.StringIO()
+        df.to_csv(output, index=False)
+    # nothing reaches the client before the whole file is built
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, len(output.getvalue())
+
+
+def run_streaming(app):
+    from app.database.models import User
+    from app.utils import generate_access_token_and_refresh_token
+
+    with app.app_context():
+        user = User.query.first()
+        with app.test_request_context():
+            token = generate_access_token_and_refresh_token(user.user_id, user.email)["access_token"]
+
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.get("/recipe/download-recipes?format=csv", buffered=False,
+                          headers={"Authorization": f"Bearer {token}", "Accept-Encoding": "identity"})
+    first_byte = None
+    size = 0
+    for chunk in response.response:
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        size += len(chunk)
+    response.close()
+    return first_byte, time.perf_counter() - start, size
+
+
+def child(mode, rows):
+    from run import app
+
+    if mode == "seed":
+        seed(app, rows)
+        return
+    baseline = peak_rss_mb()
+    first_byte, total, size = {"pandas": run_pandas, "streaming": run_streaming}[mode](app)
+    print(json.dumps({"first_byte": first_byte, "total": total, "bytes": size,
+                      "peak_rss_mb": peak_rss_mb(), "baseline_rss_mb": baseline}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--mode", choices=["seed", "pandas", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        return child(args.mode, args.rows)
+
+    run = lambda mode: subprocess.run([sys.executable, __file__, "--rows", str(args.rows), "--mode", mode],
+                                      check=True, stdout=subprocess.PIPE, text=True).stdout
+    run("seed")
+    print(f"rows: {args.rows}")
+    print(f"{'mode':<10} {'first byte':>12} {'total':>10} {'MB sent':>9} {'peak RSS':>10} {'over base':>10}")
+    for mode in ("pandas", "streaming"):
+        result = json.loads(run(mode).strip().splitlines()[-1])
+        print(f"{mode:<10} {result['first_byte'] * 1000:10.0f}ms {result['total']:9.2f}s "
+              f"{result['bytes'] / 2**20:9.1f} {result['peak_rss_mb']:8.0f}MB "
+              f"{result['peak_rss_mb'] - result['baseline_rss_mb']:8.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare the stdlib and orjson JSON providers on /recipe/user payloads.
+
+Each provider encodes the same page twice: once with UUIDs and datetimes
+already stringified by the serializer, once with native values. "encode"
+times provider.dumps alone, "total" includes building the page.
+
+    python scripts/benchmark_json.py --rows 1000 --repeat 20
+"""
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from app.utils import response
+from app.json_provider import JSON_PROVIDERS, orjson
+from app.schemas.schema import RecipeSchema
+from app.schemas.serializer import fast_dump, get_schema
+from scripts.benchmark_serializers import build_recipes, best_of
+
+
+def recipe_user_payload(recipes, native):
+    """
+    Body of GET /recipe/user as built by the route.
+    """
+    schema = get_schema(RecipeSchema, many=True)
+    return response(True, "Success", {
+        "data": fast_dump(schema, recipes, native=native),
+        "meta": {
+            "total": len(recipes),
+            "total_is_exact": True,
+            "count_strategy": "cached",
+            "page": 1,
+            "per_page": len(recipes),
+            "pages": 1,
+        },
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    recipes = build_recipes(args.rows)
+    names = ["stdlib"] + (["orjson"] if orjson is not None else [])
+    decoded = []
+    print(f"rows: {args.rows}")
+    print(f"{'provider':8} {'values':8} {'encode':>10} {'total':>10}")
+    for name in names:
+        provider = JSON_PROVIDERS[name](app)
+        for native in (False, True):
+            payload = recipe_user_payload(recipes, native)
+            decoded.append(json.loads(provider.dumps(payload)))
+            encode = best_of(args.repeat, lambda: provider.dumps(payload))
+            total = best_of(args.repeat, lambda: provider.dumps(recipe_user_payload(recipes, native)))
+            values = "native" if native else "strings"
+            print(f"{name:8} {values:8} {encode * 1000:7.2f} ms {total * 1000:7.2f} ms")
+
+    if any(document != decoded[0] for document in decoded):
+        sys.exit("providers produced different JSON")
+    if orjson is None:
+        print("orjson is not installed, only stdlib was measured")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Login password checks per second from --threads concurrent request
+threads: hashing inline on the request thread (the previous behaviour)
+against the process pool of app.auth.password_hasher.
+
+    python scripts/benchmark_password_hashing.py --threads 16 --checks 200
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app.auth.password_hasher import PasswordHasher
+
+
+def throughput(hasher, pwhash, threads, checks):
+    """
+    Checks per second with `threads` callers verifying `checks` passwords.
+    """
+    # start the pool outside the timing
+    hasher.verify(pwhash, "correct horse")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as callers:
+        results = list(callers.map(lambda _: hasher.verify(pwhash, "correct horse"), range(checks)))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return checks / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--method", default=Config.PASSWORD_HASH_METHOD)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--checks", type=int, default=200)
+    args = parser.parse_args()
+
+    inline = PasswordHasher(args.method, workers=0, queue_size=args.threads, timeout=60)
+    pooled = PasswordHasher(args.method, workers=args.workers, queue_size=args.threads, timeout=60)
+    pwhash = inline.hash("correct horse")
+
+    print(f"method: {args.method}, threads: {args.threads}, pool workers: {args.workers}")
+    print(f"{'mode':<8} {'checks/s':>10} {'per core':>10}")
+    try:
+        for name, hasher, busy in (("inline", inline, args.threads), ("pool", pooled, args.workers)):
+            rate = throughput(hasher, pwhash, args.threads, args.checks)
+            # cores the mode can keep busy at once
+            cores = min(busy, os.cpu_count() or 1)
+            print(f"{name:<8} {rate:10.1f} {rate / cores:10.1f}")
+    finally:
+        pooled.shutdown()
+
+
+if __name__ == "__main__":
+    main()
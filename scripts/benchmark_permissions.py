@@ -0,0 +1,87 @@
+"""
+Queries and latency of one permission_required check: the previous
+per-request ORM walk (User lookup, has_role, has_permission over each
+role's permissions) against the effective-permission cache, cold and warm.
+Runs on the database in DATABASE_URI and adds a throwaway user with
+--roles roles of --permissions permissions each.
+
+    python scripts/benchmark_permissions.py --roles 3 --permissions 10
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(roles, permissions):
+    from extentions import db
+    from app.database.models import User, Role, Permission
+
+    tag = uuid.uuid4().hex[:8]
+    user = User(first_name="bench", last_name="permissions", email=f"{tag}@bench.example",
+                password="x", is_verified=True)
+    for r in range(roles):
+        role = Role(name=f"bench-{tag}-role{r}")
+        role.permissions = [Permission(name=f"bench-{tag}-r{r}-p{p}") for p in range(permissions)]
+        user.roles.append(role)
+    db.session.add(user)
+    db.session.commit()
+    # the last permission of the last role: the slowest case for the ORM walk
+    return user.user_id, f"bench-{tag}-r{roles - 1}-p{permissions - 1}"
+
+
+def measure(iterations, check):
+    from extentions import db
+    from app.database.query_stats import capture_queries
+
+    queries = 0
+    elapsed = 0.0
+    for _ in range(iterations):
+        # every request starts with an empty session
+        db.session.remove()
+        with capture_queries() as stats:
+            start = time.perf_counter()
+            assert check()
+            elapsed += time.perf_counter() - start
+        queries += stats.count
+    return queries / iterations, elapsed / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roles", type=int, default=3)
+    parser.add_argument("--permissions", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    from run import app
+    from extentions import db
+    from app.database.models import User
+    from app.auth.permission_cache import get_effective_permissions, permission_cache
+
+    with app.app_context():
+        user_id, permission = seed(args.roles, args.permissions)
+
+        def orm_walk():
+            user = db.session.get(User, user_id)
+            return user.has_role("admin") or user.has_permission(permission)
+
+        def cache_cold():
+            permission_cache.clear()
+            return permission in get_effective_permissions(user_id).permissions
+
+        def cache_warm():
+            return permission in get_effective_permissions(user_id).permissions
+
+        print(f"roles: {args.roles}, permissions per role: {args.permissions}")
+        print(f"{'check':<12} {'queries':>8} {'latency':>12}")
+        for name, check in (("orm walk", orm_walk), ("cache cold", cache_cold), ("cache warm", cache_warm)):
+            queries, latency = measure(args.iterations, check)
+            print(f"{name:<12} {queries:8.1f} {latency * 1e6:10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare marshmallow Schema.dump with the compiled serializers from
+app.schemas.serializer on in-memory recipes with nested authors.
+
+    python scripts/benchmark_serializers.py --rows 10000 --repeat 5
+"""
+import os
+import sys
+import uuid
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.models import User, Recipe
+from app.schemas.schema import RecipeSchema
+from app.schemas.serializer import fast_dump, get_schema
+
+
+def build_recipes(rows):
+    """
+    Transient Recipe objects, ten per author; no database is needed.
+    """
+    now = datetime.utcnow()
+    authors = [
+        User(user_id=uuid.uuid4(), first_name=f"first{i}", last_name=f"last{i}",
+             email=f"user{i}@bench.example", password="x", is_verified=True,
+             is_deleted=False, country="NL", created_at=now)
+        for i in range(max(rows // 10, 1))
+    ]
+    return [
+        Recipe(recipe_id=uuid.uuid4(), author_id=authors[i % len(authors)].user_id,
+               category_id=uuid.uuid4(), title=f"Recipe {i}", description="A recipe",
+               content="Mix everything. " * 10, author=authors[i % len(authors)],
+               created_at=now - timedelta(minutes=i), updated_at=now)
+        for i in range(rows)
+    ]
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    recipes = build_recipes(args.rows)
+    schema = get_schema(RecipeSchema, many=True)
+
+    if schema.dump(recipes) != fast_dump(schema, recipes):
+        sys.exit("compiled serializer output differs from Schema.dump")
+
+    marshmallow_time = best_of(args.repeat, lambda: schema.dump(recipes))
+    compiled_time = best_of(args.repeat, lambda: fast_dump(schema, recipes))
+
+    print(f"rows:           {args.rows}")
+    print(f"Schema.dump:    {marshmallow_time * 1000:8.1f} ms")
+    print(f"compiled:       {compiled_time * 1000:8.1f} ms")
+    print(f"speedup:        {marshmallow_time / compiled_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Print EXPLAIN ANALYZE plans for the queries issued by the main routes.
+
+Seed a dataset once, then compare plans before and after the index migration:
+
+    python scripts/explain_routes.py --seed 100000
+    python scripts/explain_routes.py > before.txt
+    flask db upgrade
+    python scripts/explain_routes.py > after.txt
+"""
+import os
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run import app
+from extentions import db
+from sqlalchemy import text
+from app.db_driver import bulk_insert
+from app.database.models import User, Recipe, RecipeCategories, Favorites, Comments
+
+
+SEED_DOMAIN = "seed.example"
+
+
+def seed(users):
+    """
+    Insert `users` users with 5 recipes, 10 favorites and 5 comments per user.
+    """
+    now = datetime.utcnow()
+    user_rows = [{
+        "first_name": f"first{i}",
+        "last_name": f"last{i}",
+        "email": f"user{i}@{SEED_DOMAIN}",
+        "password": "seeded",
+        "is_verified": i % 10 != 0,
+        "is_deleted": i % 20 == 0,
+        "reset_token": f"{i:036d}" if i % 50 == 0 else None,
+        "created_at": now - timedelta(seconds=i),
+    } for i in range(users)]
+    user_ids = [row["user_id"] for row in bulk_insert(User, user_rows)]
+
+    category_ids = [row["category_id"] for row in bulk_insert(
+        RecipeCategories, [{"category_name": f"category{i}"} for i in range(20)])]
+
+    recipe_ids = [row["recipe_id"] for row in bulk_insert(Recipe, [{
+        "author_id": user_ids[i % users],
+        "category_id": category_ids[i % len(category_ids)],
+        "title": f"recipe {i}",
+        "description": "seeded recipe",
+        "content": "step " * 50,
+        "created_at": now - timedelta(seconds=i),
+    } for i in range(users * 5)])]
+
+    favorites = {(random.choice(user_ids), random.choice(recipe_ids)) for _ in range(users * 10)}
+    bulk_insert(Favorites, [{"user_id": user_id, "recipe_id": recipe_id} for user_id, recipe_id in favorites])
+
+    bulk_insert(Comments, [{
+        "user_id": random.choice(user_ids),
+        "recipe_id": random.choice(recipe_ids),
+        "Comment": "seeded comment",
+    } for _ in range(users * 5)])
+
+    db.session.execute(text("ANALYZE"))
+    db.session.commit()
+
+
+def route_queries():
+    """
+    (label, query) pairs matching the shapes used in the route modules.
+    """
+    user = User.query.filter(User.email.like(f"%@{SEED_DOMAIN}"), User.is_verified.is_(True),
+                             User.is_deleted.is_(False)).first()
+    if user is None:
+        raise SystemExit("No seeded users found, run with --seed first.")
+    favorite = Favorites.query.filter_by(user_id=user.user_id).first() or Favorites.query.first()
+    token_user = User.query.filter(User.reset_token.isnot(None)).first()
+
+    return [
+        ("signin: user by email", User.query.filter_by(email=user.email, is_deleted=False, is_verified=True)),
+        ("auth: active user by id", User.query.filter_by(user_id=user.user_id, is_verified=True, is_deleted=False)),
+        ("get-all-user: page", User.query.filter_by(is_deleted=False).order_by(User.created_at, User.user_id).limit(10)),
+        ("get-all-user: count", User.query.filter_by(is_deleted=False).with_entities(db.func.count())),
+        ("reset-password: user by token", User.query.filter_by(reset_token=token_user.reset_token if token_user else "x",
+                                                               is_verified=True, is_deleted=False)),
+        ("recipe/user: page", Recipe.query.filter_by(author_id=user.user_id)
+            .order_by(Recipe.created_at, Recipe.recipe_id).limit(10)),
+        ("recipe/user: count", Recipe.query.filter_by(author_id=user.user_id).with_entities(db.func.count())),
+        ("favorites: by user", Favorites.query.filter_by(user_id=user.user_id)),
+        ("add-to-favorite: existing", Favorites.query.filter_by(recipe_id=favorite.recipe_id, user_id=favorite.user_id)),
+        ("favorites: by recipe", Favorites.query.filter_by(recipe_id=favorite.recipe_id)),
+        ("comments: by recipe", Comments.query.filter_by(recipe_id=favorite.recipe_id).order_by(Comments.created_at)),
+        ("comments: by user", Comments.query.filter_by(user_id=user.user_id)),
+    ]
+
+
+def explain(query):
+    sql = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")).scalars().all()
+    return "\n".join(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="number of users to seed before explaining")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.seed:
+            seed(args.seed)
+            print(f"Seeded {args.seed} users.")
+
+        for label, query in route_queries():
+            print(f"=== {label}")
+            print(explain(query))
+            print()
+
+
+if __name__ == "__main__":
+    main()
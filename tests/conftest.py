@@ -0,0 +1,218 @@
+"""
+Shared fixtures. The suite runs against TEST_DATABASE_URI, an in-memory
+SQLite database unless set; the environment is fixed before config.py is
+imported so a developer's .env never points the tests at a real database.
+"""
+import os
+import sys
+import uuid
+import socketserver
+import threading
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.update({
+    "DATABASE_URI": os.getenv("TEST_DATABASE_URI", "sqlite://"),
+    "DATABASE_REPLICA_URIS": "",
+    "SECRET_KEY": "test-secret-key-0123456789abcdef0123",
+    "JWT_ISSUER": "tests",
+    "MAIL_DEFAULT_SENDER": "noreply@tests.example",
+    "PASSWORD_HASH_WORKERS": "0",
+    "RESPONSE_CACHE_BACKEND": "memory",
+    "CATEGORY_REGISTRY_PRELOAD": "false",
+})
+
+from sqlalchemy.sql import sqltypes
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+
+
+def _sqlite_compat():
+    """
+    Let SQLite stand in for PostgreSQL: accept str UUID parameters as
+    psycopg2 does, and store UUIDs as text so hex ids that look like numbers
+    are not coerced by SQLite's NUMERIC affinity.
+    """
+    bind_processor = sqltypes.Uuid.bind_processor
+
+    def uuid_bind_processor(self, dialect):
+        process = bind_processor(self, dialect)
+        if process is None:
+            return None
+        return lambda value: process(uuid.UUID(value) if isinstance(value, str) else value)
+
+    sqltypes.Uuid.bind_processor = uuid_bind_processor
+    SQLiteTypeCompiler.visit_UUID = lambda self, type_, **kw: "CHAR(32)"
+
+
+if os.environ["DATABASE_URI"].startswith("sqlite"):
+    _sqlite_compat()
+
+from run import app as flask_app
+from extentions import db, response_cache
+from app.database.models import User, Role, Permission, RecipeCategories
+from app.category_registry import category_registry
+from app.database.query_stats import assert_max_queries
+from app.auth.permission_cache import permission_cache, authz_versions
+from app.auth.identity_cache import identity_cache
+from app.pagination import count_cache
+from app.smtp_pool import smtp_pool
+from app.utils import generate_access_token_and_refresh_token
+
+
+@pytest.fixture(scope="session")
+def app():
+    with flask_app.app_context():
+        db.create_all()
+    yield flask_app
+    with flask_app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture(autouse=True)
+def clean_state(app):
+    """
+    Empty every table and in-process cache after each test.
+    """
+    yield
+    with app.app_context():
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+    for cache in (permission_cache, authz_versions, identity_cache, count_cache):
+        cache.clear()
+    if response_cache.backend is not None:
+        response_cache.backend.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """
+    Create a verified user; returns (user_id, Authorization headers).
+    """
+    def make(**fields):
+        with app.app_context():
+            user = User(first_name="Test", last_name="User", email=f"{uuid.uuid4().hex}@tests.example",
+                        password="not-a-hash", is_verified=True, **fields)
+            db.session.add(user)
+            db.session.commit()
+            with app.test_request_context():
+                token = generate_access_token_and_refresh_token(user.user_id, user.email)["access_token"]
+            return user.user_id, {"Authorization": f"Bearer {token}"}
+    return make
+
+
+@pytest.fixture
+def grant(app):
+    """
+    Give a user a new role holding the named permissions.
+    """
+    def grant_permissions(user_id, *permission_names):
+        with app.app_context():
+            role = Role(name=f"role-{uuid.uuid4().hex[:8]}",
+                        permissions=[Permission(name=name) for name in permission_names])
+            db.session.get(User, user_id).roles.append(role)
+            db.session.commit()
+    return grant_permissions
+
+
+@pytest.fixture
+def make_category(app):
+    """
+    Create a recipe category and load it into the registry; returns its id.
+    """
+    def make(name="Soups"):
+        with app.app_context():
+            category = RecipeCategories(category_name=name)
+            db.session.add(category)
+            db.session.commit()
+            category_registry.reload()
+            return str(category.category_id)
+    return make
+
+
+@pytest.fixture
+def max_queries(app):
+    """
+    assert_max_queries, e.g. `with max_queries(1): client.get(...)`.
+    """
+    return assert_max_queries
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP for smtplib: every command is accepted except RCPT TO
+    for addresses in `server.rejected`.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        recipients = []
+        self.reply("220 localhost stand-in SMTP")
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip().strip("<>")
+                if address in server.rejected:
+                    self.reply("550 No such user")
+                else:
+                    recipients.append(address)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data in self.rfile:
+                    if data in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data)
+                server.messages.append({"recipients": recipients, "data": b"".join(lines)})
+                recipients = []
+                self.reply("250 Queued")
+            elif verb == "RSET":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                # MAIL FROM, NOOP
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_server(app, monkeypatch):
+    """
+    Local stand-in SMTP server that Flask-Mail and the SMTP pool send to.
+    `messages` collects what it received; add addresses to `rejected` to
+    refuse them.
+    """
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.messages = []
+    server.rejected = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    state = app.extensions["mail"]
+    monkeypatch.setattr(state, "server", "127.0.0.1")
+    monkeypatch.setattr(state, "port", server.server_address[1])
+    monkeypatch.setattr(state, "use_tls", False)
+    monkeypatch.setattr(state, "use_ssl", False)
+    monkeypatch.setattr(state, "username", None)
+    monkeypatch.setattr(state, "suppress", False)
+    yield server
+    smtp_pool.close_all()
+    server.shutdown()
+    server.server_close()
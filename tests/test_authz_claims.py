@@ -0,0 +1,57 @@
+import pytest
+from config import Config
+from extentions import db
+from app.database.models import Role
+from app.auth.permission_cache import authz_versions, bump_authz_version
+from app.utils import generate_access_token_and_refresh_token
+
+
+@pytest.fixture
+def embedded_claims(monkeypatch):
+    monkeypatch.setattr(Config, "JWT_EMBED_AUTHZ_CLAIMS", True)
+
+
+def issue_token(app, user_id):
+    with app.test_request_context():
+        token = generate_access_token_and_refresh_token(user_id, "claims@tests.example")["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_role_change_revokes_claim_tokens(app, client, make_user, grant, embedded_claims):
+    user_id, _ = make_user()
+    grant(user_id, "manage_roles")
+    with app.app_context():
+        role = Role(name="member")
+        db.session.add(role)
+        db.session.commit()
+        role_id = str(role.role_id)
+    path = f"/roles/{role_id}/bulk-assign-users"
+
+    old_headers = issue_token(app, user_id)
+    assert client.post(path, json={"user_ids": []}, headers=old_headers).status_code == 200
+
+    assert client.post(f"/roles/users/{user_id}/assign-roles", json={"role_ids": [role_id]}).status_code == 200
+
+    outdated = client.post(path, json={"user_ids": []}, headers=old_headers)
+    assert outdated.status_code == 401
+    assert "outdated" in outdated.get_json()["message"]
+    assert client.post(path, json={"user_ids": []}, headers=issue_token(app, user_id)).status_code == 200
+
+
+
+def test_other_processes_revoke_once_the_version_expires(app, client, make_user, grant, embedded_claims):
+    user_id, _ = make_user()
+    grant(user_id, "manage_roles")
+    headers = issue_token(app, user_id)
+    path = "/roles/users/00000000-0000-0000-0000-000000000000/bulk-assign-roles"
+    assert client.post(path, json={"role_ids": []}, headers=headers).status_code == 404
+
+    # a role change committed by another process leaves this one's cache alone
+    with app.app_context():
+        bump_authz_version(user_ids=[user_id])
+        db.session.commit()
+    assert client.post(path, json={"role_ids": []}, headers=headers).status_code == 404
+
+    # until AUTHZ_VERSION_CACHE_TTL has passed
+    authz_versions.clear()
+    assert client.post(path, json={"role_ids": []}, headers=headers).status_code == 401
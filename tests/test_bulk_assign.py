@@ -0,0 +1,94 @@
+import uuid
+import pytest
+from sqlalchemy import inspect
+from extentions import db
+from app.database.models import User, Role, Permission
+
+
+@pytest.fixture
+def admin_headers(make_user, grant):
+    user_id, headers = make_user()
+    grant(user_id, "manage_roles")
+    return headers
+
+
+def create(app, model, **fields):
+    with app.app_context():
+        row = model(**fields)
+        db.session.add(row)
+        db.session.commit()
+        return str(inspect(row).identity[0])
+
+
+def authz_versions(app, *user_ids):
+    with app.app_context():
+        return [db.session.get(User, uuid.UUID(str(user_id))).authz_version for user_id in user_ids]
+
+
+def assign_users(client, role_id, user_ids, headers):
+    return client.post(f"/roles/{role_id}/bulk-assign-users", json={"user_ids": user_ids}, headers=headers)
+
+
+def test_assign_users_counts_and_dedupes(app, client, make_user, admin_headers):
+    role_id = create(app, Role, name="member")
+    first, second = str(make_user()[0]), str(make_user()[0])
+    unknown = str(uuid.uuid4())
+
+    result = assign_users(client, role_id, [first, first, second, "abc", unknown], admin_headers)
+
+    assert result.status_code == 200
+    assert result.get_json()["data"] == {
+        "requested": 4, "assigned": 2, "already_assigned": 0, "not_found": ["abc", unknown],
+    }
+
+
+def test_repeated_assignment_keeps_tokens_valid(app, client, make_user, admin_headers):
+    role_id = create(app, Role, name="member")
+    first, second = str(make_user()[0]), str(make_user()[0])
+    assign_users(client, role_id, [first], admin_headers)
+    before = authz_versions(app, first, second)
+
+    result = assign_users(client, role_id, [first, second], admin_headers).get_json()["data"]
+    assert (result["assigned"], result["already_assigned"]) == (1, 1)
+    # only the user who gained the role is bumped
+    assert authz_versions(app, first, second) == [before[0], before[1] + 1]
+
+    result = assign_users(client, role_id, [first, second], admin_headers).get_json()["data"]
+    assert (result["assigned"], result["already_assigned"]) == (0, 2)
+    assert authz_versions(app, first, second) == [before[0], before[1] + 1]
+
+
+def test_assign_roles_and_permissions(app, client, make_user, admin_headers):
+    user_id = str(make_user()[0])
+    role_ids = [create(app, Role, name=f"role{index}") for index in range(2)]
+    permission_ids = [create(app, Permission, name=f"perm{index}") for index in range(2)]
+
+    for _ in range(2):
+        roles = client.post(f"/roles/users/{user_id}/bulk-assign-roles",
+                            json={"role_ids": role_ids}, headers=admin_headers)
+        permissions = client.post(f"/roles/{role_ids[0]}/bulk-assign-permissions",
+                                  json={"permission_ids": permission_ids}, headers=admin_headers)
+        assert roles.status_code == permissions.status_code == 200
+
+    assert roles.get_json()["data"]["already_assigned"] == 2
+    assert permissions.get_json()["data"]["already_assigned"] == 2
+    with app.app_context():
+        assert db.session.get(User, uuid.UUID(user_id)).roles.count() == 2
+        assert len(db.session.get(Role, uuid.UUID(role_ids[0])).permissions) == 2
+
+
+@pytest.mark.parametrize("payload", [{"user_ids": "abc"}, {"user_ids": {"id": "abc"}}, {}])
+def test_non_list_ids_are_rejected(app, client, admin_headers, payload):
+    role_id = create(app, Role, name="member")
+    result = client.post(f"/roles/{role_id}/bulk-assign-users", json=payload, headers=admin_headers)
+    assert result.status_code == 400
+    assert "must be a list" in result.get_json()["message"]
+
+
+def test_bulk_endpoints_need_manage_roles(app, client, make_user):
+    user_id, headers = make_user()
+    role_id = create(app, Role, name="member")
+    for path, payload in ((f"/roles/{role_id}/bulk-assign-users", {"user_ids": [str(user_id)]}),
+                          (f"/roles/users/{user_id}/bulk-assign-roles", {"role_ids": [role_id]}),
+                          (f"/roles/{role_id}/bulk-assign-permissions", {"permission_ids": []})):
+        assert client.post(path, json=payload, headers=headers).status_code == 403
@@ -0,0 +1,37 @@
+import gzip
+import pytest
+from flask import Response
+from app.compression import ResponseCompression, DEFAULT_MIMETYPES
+
+BODY = '{"data": "%s"}' % ("x" * 2000)
+
+
+def compress(app, status, mimetype="application/json"):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        return ResponseCompression()._compress(Response(BODY, status=status, mimetype=mimetype))
+
+
+@pytest.mark.parametrize("status", [200, 201])
+def test_success_is_compressed(app, status):
+    response = compress(app, status)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.get_data()).decode() == BODY
+
+
+@pytest.mark.parametrize("status", [204, 301, 400, 404, 500, 503])
+def test_other_statuses_are_sent_as_is(app, status):
+    response = compress(app, status)
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data(as_text=True) == BODY
+
+
+def test_mimetypes_default_and_override(app):
+    assert app.config["COMPRESS_MIMETYPES"] is None
+    assert "Content-Encoding" in compress(app, 200, DEFAULT_MIMETYPES[-1]).headers
+
+    app.config["COMPRESS_MIMETYPES"] = ["text/csv"]
+    try:
+        assert "Content-Encoding" not in compress(app, 200, "application/json").headers
+        assert "Content-Encoding" in compress(app, 200, "text/csv").headers
+    finally:
+        app.config["COMPRESS_MIMETYPES"] = None
@@ -0,0 +1,52 @@
+import pytest
+from extentions import db
+from app.database.models import Role, Permission
+from app.conditional import _etag
+
+
+@pytest.fixture
+def catalog(app):
+    with app.app_context():
+        db.session.add_all([Role(name="editor"), Permission(name="create_recipe")])
+        db.session.commit()
+
+
+@pytest.mark.parametrize("path", ["/roles/get-roles", "/permissions/get-permissions"])
+def test_unchanged_list_is_not_modified(client, max_queries, catalog, path):
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    with max_queries(1):
+        again = client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.get_data() == b""
+
+
+def test_user_recipes_not_modified(client, max_queries, make_user):
+    _, headers = make_user()
+    first = client.get("/recipe/user", headers=headers)
+    assert first.status_code == 200
+
+    with max_queries(1):
+        again = client.get("/recipe/user", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_etag_changes_after_write(app, client, catalog):
+    etag = client.get("/roles/get-roles").headers["ETag"]
+    with app.app_context():
+        db.session.add(Role(name="reviewer"))
+        db.session.commit()
+
+    again = client.get("/roles/get-roles", headers={"If-None-Match": etag})
+    assert again.status_code == 200
+    assert again.headers["ETag"] != etag
+
+
+def test_per_user_etag_depends_on_user(app):
+    values = (None, 0)
+    with app.test_request_context("/recipe/user"):
+        assert _etag(values, "user-a") != _etag(values, "user-b")
+        assert _etag(values, "user-a") == _etag(values, "user-a")
@@ -0,0 +1,55 @@
+import threading
+from jinja2 import Environment, DictLoader
+from app.email_renderer import CompiledEmailTemplate
+
+
+def context(index):
+    return {
+        "user": {"first_name": f"first{index}", "last_name": "<last>"},
+        "verification_code": f"{index:06d}",
+        "your_name": "Golden Recipe!!",
+    }
+
+
+def test_split_render_matches_jinja(app):
+    with app.app_context():
+        template = CompiledEmailTemplate(app.jinja_env, "verification_email.html")
+        assert template.is_split
+        html, text = template.render(context(1))
+        assert html == template.template.render(context(1))
+        assert "000001" in text and "First1" in text
+        assert template.verified
+
+
+def test_concurrent_first_renders(app):
+    template = CompiledEmailTemplate(app.jinja_env, "verification_email.html")
+    errors = []
+    start = threading.Barrier(8)
+
+    def send(worker):
+        try:
+            with app.app_context():
+                start.wait()
+                for index in range(worker * 50, worker * 50 + 50):
+                    html, _ = template.render(context(index))
+                    assert html == template.template.render(context(index))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=send, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert template.verified and template.is_split
+
+
+def test_template_with_blocks_is_rendered_by_jinja():
+    env = Environment(loader=DictLoader({"list.html": "{% for item in items %}<p>{{ item }}</p>{% endfor %}"}),
+                      autoescape=True)
+    template = CompiledEmailTemplate(env, "list.html")
+    assert not template.is_split and template.verified
+    html, text = template.render({"items": ["a", "<b>"]})
+    assert html == "<p>a</p><p>&lt;b&gt;</p>"
+    assert text == "a\n\n<b>"
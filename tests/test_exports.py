@@ -0,0 +1,105 @@
+import csv
+import io
+import pytest
+from extentions import db
+from app.database.models import Recipe
+from app.exports import csv_chunks, write_xlsx
+
+HEADER = ["id", "title"]
+
+
+def add_recipes(app, make_user, make_category, recipes):
+    author_id, headers = make_user()
+    category_id = make_category()
+    with app.app_context():
+        db.session.add_all(Recipe(author_id=author_id, category_id=category_id, **fields) for fields in recipes)
+        db.session.commit()
+    return headers
+
+
+def test_csv_chunks_one_chunk_per_batch():
+    chunks = list(csv_chunks(HEADER, [[(1, "Soup")], [(2, 'Tea, "green"'), (3, "Pie\nwith crust")]]))
+    assert chunks == ['id,title\n1,Soup\n', '2,"Tea, ""green"""\n3,"Pie\nwith crust"\n']
+
+
+def test_csv_chunks_closes_generators_and_accepts_iterators():
+    closed = []
+
+    def batches():
+        try:
+            yield [(1, "Soup")]
+            yield [(2, "Tea")]
+        finally:
+            closed.append(True)
+
+    chunks = csv_chunks(HEADER, batches())
+    next(chunks)
+    chunks.close()
+    assert closed == [True]
+
+    assert "".join(csv_chunks(HEADER, iter([[(1, "Soup")]]))) == "id,title\n1,Soup\n"
+
+
+def test_csv_export_matches_pandas(app, client, make_user, make_category):
+    pd = pytest.importorskip("pandas")
+    from app.routes.recipe_routes import RECIPE_EXPORT_COLUMNS
+
+    headers = add_recipes(app, make_user, make_category, [
+        {"title": "Soup", "description": None, "content": "Boil water."},
+        {"title": 'Tea, "green"', "description": "Hot", "content": "Steep\nthree minutes."},
+    ])
+    result = client.get("/recipe/download-recipes?format=csv", headers=headers)
+    assert result.status_code == 200
+    assert result.mimetype == "text/csv"
+
+    with app.app_context():
+        rows = db.session.execute(db.select(*(getattr(Recipe, column) for column in RECIPE_EXPORT_COLUMNS))).all()
+    expected = io.StringIO()
+    pd.DataFrame([row._asdict() for row in rows]).to_csv(expected, index=False)
+    assert result.get_data(as_text=True) == expected.getvalue()
+    assert len(list(csv.reader(io.StringIO(result.get_data(as_text=True))))) == 3
+
+
+@pytest.mark.parametrize("file_format", ["csv", "excel"])
+def test_empty_table_is_not_found(client, make_user, file_format):
+    _, headers = make_user()
+    result = client.get(f"/recipe/download-recipes?format={file_format}", headers=headers)
+    assert result.status_code == 404
+
+
+def read_workbook(output):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.load_workbook(output, read_only=True)
+    return {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)] for sheet in workbook.worksheets}
+
+
+def test_xlsx_starts_a_sheet_every_rows_per_sheet():
+    batches = [[(1, "Soup"), (2, "Tea")], [(3, "Pie"), (4, "Stew"), (5, "Cake")]]
+    output = write_xlsx(HEADER, iter(batches), "Recipes", spool_max_size=1 << 20, rows_per_sheet=3)
+
+    assert read_workbook(output) == {
+        "Recipes": [HEADER, [1, "Soup"], [2, "Tea"]],
+        "Recipes 2": [HEADER, [3, "Pie"], [4, "Stew"]],
+        "Recipes 3": [HEADER, [5, "Cake"]],
+    }
+
+
+def test_xlsx_spools_to_disk_past_the_threshold():
+    batches = [[(index, f"Recipe {index}") for index in range(100)]]
+    in_memory = write_xlsx(HEADER, batches, "Recipes", spool_max_size=1 << 20)
+    on_disk = write_xlsx(HEADER, batches, "Recipes", spool_max_size=1024)
+
+    assert not in_memory._rolled
+    assert on_disk._rolled
+    assert read_workbook(on_disk) == read_workbook(in_memory)
+
+
+def test_excel_export(app, client, make_user, make_category):
+    headers = add_recipes(app, make_user, make_category, [{"title": "Soup", "content": "Boil water."}])
+    result = client.get("/recipe/download-recipes?format=excel", headers=headers)
+
+    assert result.status_code == 200
+    assert result.headers["Content-Disposition"] == "attachment; filename=recipes.xlsx"
+    [rows] = read_workbook(io.BytesIO(result.get_data())).values()
+    assert rows[0] == ["recipe_id", "author_id", "title", "description", "content", "created_at", "updated_at"]
+    assert rows[1][2:5] == ["Soup", None, "Boil water."]
@@ -0,0 +1,63 @@
+import pytest
+from extentions import db
+from app.database.models import User, Role
+from app.auth.identity_cache import get_active_user, identity_cache
+
+
+def active_user(app, user_id):
+    """
+    get_active_user as a new request sees it.
+    """
+    with app.test_request_context():
+        return get_active_user(user_id)
+
+
+def test_update_user_is_seen_by_next_request(app, client, make_user):
+    user_id, headers = make_user()
+    assert active_user(app, user_id).first_name == "Test"
+
+    result = client.patch("/users/update-user", data={"first_name": "Renamed"}, headers=headers)
+    assert result.status_code == 201
+    assert active_user(app, user_id).first_name == "Renamed"
+
+
+def test_deleted_user_is_gone(app, client, make_user, grant):
+    user_id, headers = make_user()
+    grant(user_id, "delete_user")
+    assert active_user(app, user_id) is not None
+
+    assert client.patch("/users/delete-user", headers=headers).status_code == 201
+    assert active_user(app, user_id) is None
+    assert client.get("/recipe/user", headers=headers).status_code == 404
+
+
+def test_change_password_drops_snapshot(app, client, make_user):
+    user_id, headers = make_user()
+    with app.app_context():
+        db.session.get(User, user_id).hash_password("old password")
+        db.session.commit()
+    assert active_user(app, user_id) is not None
+
+    result = client.post("/users/update-password", headers=headers,
+                         json={"old_password": "old password", "new_password": "new password"})
+    assert result.status_code == 200
+    assert str(user_id) not in identity_cache
+    assert active_user(app, user_id) is not None
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_role_assignment_drops_snapshot(app, client, make_user, grant, bulk):
+    admin_id, headers = make_user()
+    grant(admin_id, "manage_roles")
+    user_id, _ = make_user()
+    with app.app_context():
+        role = Role(name="editor")
+        db.session.add(role)
+        db.session.commit()
+        role_id = str(role.role_id)
+    assert active_user(app, user_id) is not None
+
+    path = f"/roles/users/{user_id}/{'bulk-assign-roles' if bulk else 'assign-roles'}"
+    assert client.post(path, json={"role_ids": [role_id]}, headers=headers).status_code == 200
+    assert str(user_id) not in identity_cache
+    assert active_user(app, user_id).user_id == user_id
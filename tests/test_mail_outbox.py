@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from config import Config
+from extentions import db
+from app.database.models import EmailOutbox
+from app.mail_outbox import process_outbox_batch
+from app.utils import send_email
+
+CONTEXT = {"user": {"first_name": "Ada", "last_name": "Lovelace"}, "verification_code": "123456",
+           "your_name": "Golden Recipe!!"}
+
+
+def enqueue(*recipients):
+    for recipient in recipients:
+        send_email("Verify", [recipient], "verification_email.html", CONTEXT)
+    db.session.commit()
+
+
+def outbox():
+    db.session.expire_all()
+    return EmailOutbox.query.order_by(EmailOutbox.next_attempt_at).all()
+
+
+def test_enqueue_joins_the_transaction(app):
+    with app.app_context():
+        send_email("Verify", ["ada@tests.example"], "verification_email.html", CONTEXT)
+        db.session.rollback()
+        assert outbox() == []
+
+        enqueue("ada@tests.example")
+        [email] = outbox()
+        assert email.status == EmailOutbox.STATUS_PENDING
+        assert email.next_attempt_at <= datetime.utcnow()
+
+
+def test_due_emails_are_sent(app, smtp_server):
+    with app.app_context():
+        enqueue("ada@tests.example", "grace@tests.example")
+        assert process_outbox_batch(10) == 2
+
+        assert [email.status for email in outbox()] == [EmailOutbox.STATUS_SENT] * 2
+    assert [message["recipients"] for message in smtp_server.messages] == \
+        [["ada@tests.example"], ["grace@tests.example"]]
+    assert b"123456" in smtp_server.messages[0]["data"]
+
+
+def test_refused_email_is_retried_with_backoff(app, smtp_server):
+    smtp_server.rejected.add("gone@tests.example")
+    with app.app_context():
+        enqueue("gone@tests.example", "ada@tests.example")
+        before = datetime.utcnow()
+        assert process_outbox_batch(10) == 2
+
+        emails = {email.recipients[0]: email for email in outbox()}
+        refused, sent = emails["gone@tests.example"], emails["ada@tests.example"]
+        assert sent.status == EmailOutbox.STATUS_SENT
+        assert refused.status == EmailOutbox.STATUS_PENDING
+        assert refused.attempts == 1
+        assert "No such user" in refused.last_error
+        # first retry after MAIL_OUTBOX_BACKOFF_BASE seconds, +-20% jitter
+        assert refused.next_attempt_at >= before + timedelta(seconds=Config.MAIL_OUTBOX_BACKOFF_BASE * 0.8)
+
+        # not due yet
+        assert process_outbox_batch(10) == 0
+
+
+def test_gives_up_after_max_attempts(app, smtp_server, monkeypatch):
+    monkeypatch.setattr(Config, "MAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    smtp_server.rejected.add("gone@tests.example")
+    with app.app_context():
+        enqueue("gone@tests.example")
+        for _ in range(2):
+            [email] = outbox()
+            email.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+            db.session.commit()
+            assert process_outbox_batch(10) == 1
+
+        [email] = outbox()
+        assert email.status == EmailOutbox.STATUS_FAILED
+        assert email.attempts == 2
+        assert process_outbox_batch(10) == 0
+    assert smtp_server.messages == []
+
+
+def test_mail_worker_once_drains_the_outbox(app, smtp_server, monkeypatch):
+    monkeypatch.setattr(Config, "MAIL_WORKER_BATCH_SIZE", 2)
+    with app.app_context():
+        enqueue(*(f"user{index}@tests.example" for index in range(5)))
+
+    result = app.test_cli_runner().invoke(args=["mail-worker", "--once"])
+
+    assert result.exit_code == 0, result.output
+    assert "Processed 5 emails." in result.output
+    assert len(smtp_server.messages) == 5
+    with app.app_context():
+        assert {email.status for email in outbox()} == {EmailOutbox.STATUS_SENT}
@@ -0,0 +1,61 @@
+import pytest
+from app.pagination import parse_fieldset
+from app.schemas.schema import UserSchema
+from app.schemas.serializer import _schemas, get_schema
+
+
+@pytest.mark.parametrize("per_page", [0, -1])
+def test_non_positive_per_page_is_rejected(client, per_page):
+    for path in ("/users/get-all-user", "/users/get-all-user?cursor="):
+        separator = "&" if "?" in path else "?"
+        result = client.get(f"{path}{separator}per_page={per_page}")
+        assert result.status_code == 400
+        assert "per_page" in result.get_json()["message"]
+
+
+def test_per_page_is_capped(app, client, make_user):
+    for _ in range(3):
+        make_user()
+    app.config["PAGINATION_MAX_PER_PAGE"] = 2
+    try:
+        offset = client.get("/users/get-all-user?per_page=1000").get_json()["data"]
+        keyset = client.get("/users/get-all-user?per_page=1000&cursor=").get_json()["data"]
+    finally:
+        app.config["PAGINATION_MAX_PER_PAGE"] = 100
+    assert offset["meta"]["per_page"] == 2 and len(offset["data"]) == 2
+    assert keyset["meta"]["per_page"] == 2 and len(keyset["data"]) == 2
+
+
+def test_parse_fieldset_is_canonical():
+    assert parse_fieldset("title, author.email,title") == ("author.email", "title")
+    assert parse_fieldset(" , ") is None
+
+
+def test_fieldset_permutations_share_one_schema(client):
+    _schemas.clear()
+    for fields in ("first_name,last_name", "last_name,first_name", "first_name,last_name,first_name"):
+        assert client.get(f"/users/get-all-user?fields={fields}").status_code == 200
+    assert [key[0] for key in _schemas._data] == [UserSchema]
+
+
+def test_schema_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(_schemas, "maxsize", 2)
+    for name in ("first_name", "last_name", "email"):
+        get_schema(UserSchema, many=True, only=(name,))
+    assert len(_schemas) == 2
+
+
+def test_created_recipes_are_counted(client, make_user, make_category):
+    _, headers = make_user()
+    category_id = make_category()
+    recipe = {"title": "Soup", "content": "Boil water.", "category_id": category_id}
+
+    assert client.post("/recipe/add-recipe", json=recipe, headers=headers).status_code == 201
+    assert client.get("/recipe/user", headers=headers).get_json()["data"]["meta"]["total"] == 1
+    for _ in range(2):
+        assert client.post("/recipe/add-recipe", json=recipe, headers=headers).status_code == 201
+
+    result = client.get("/recipe/user", headers=headers).get_json()["data"]
+    assert len(result["data"]) == 3
+    assert result["meta"]["total"] == 3
+    assert result["meta"]["total_is_exact"] is False
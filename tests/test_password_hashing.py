@@ -0,0 +1,59 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from extentions import db
+from app.database.models import User
+from app.auth.password_hasher import password_hasher, HashingQueueFull
+
+
+@pytest.fixture
+def queue_full(monkeypatch):
+    def busy(*args):
+        raise HashingQueueFull("Password hashing queue is full")
+    monkeypatch.setattr(password_hasher, "hash", busy)
+    monkeypatch.setattr(password_hasher, "verify", busy)
+
+
+def assert_busy(response):
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json["success"] is False
+
+
+def test_signup_queue_full(client, queue_full):
+    response = client.post("/users/singup", json={
+        "first_name": "New", "last_name": "User", "email": "new.user@tests.example", "password": "Secret123!"
+    })
+    assert_busy(response)
+    with client.application.app_context():
+        assert User.query.filter_by(email="new.user@tests.example").first() is None
+
+
+def test_signin_queue_full(client, make_user, queue_full):
+    user_id, _ = make_user()
+    with client.application.app_context():
+        email = db.session.get(User, user_id).email
+    assert_busy(client.post("/users/signin", json={"email": email, "password": "Secret123!"}))
+
+
+def test_update_password_queue_full(client, make_user, queue_full):
+    _, headers = make_user()
+    assert_busy(client.post("/users/update-password", headers=headers,
+                            json={"old_password": "Secret123!", "new_password": "Secret456!"}))
+
+
+def test_reset_password_queue_full(client, make_user, queue_full):
+    token = str(uuid.uuid4())
+    make_user(reset_token=token, reset_token_expiry=datetime.utcnow() + timedelta(hours=1))
+    assert_busy(client.post("/users/api/reset-password", json={"token": token, "new_password": "Secret456!"}))
+
+
+def test_signup_stores_only_the_hash(client):
+    response = client.post("/users/singup", json={
+        "first_name": "New", "last_name": "User", "email": "new.user@tests.example", "password": "Secret123!"
+    })
+    assert response.status_code == 201
+    with client.application.app_context():
+        user = User.query.filter_by(email="new.user@tests.example").one()
+        assert user.password != "Secret123!"
+        assert user.check_password("Secret123!")
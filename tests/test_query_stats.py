@@ -0,0 +1,45 @@
+import pytest
+from extentions import db
+from app.database.models import Role
+from app.database.query_stats import fingerprint, capture_queries
+
+
+def test_fingerprint_ignores_literals():
+    assert fingerprint("SELECT * FROM roles WHERE name = 'admin' AND id IN (1, 2, 3)") == \
+        fingerprint("SELECT *  FROM roles\nWHERE name = 'user' AND id IN (4)")
+
+
+def test_capture_queries_counts_statements(app):
+    with app.app_context():
+        with capture_queries() as stats:
+            db.session.execute(db.select(Role)).all()
+            db.session.execute(db.select(Role.name)).all()
+    assert stats.count == 2
+    assert stats.total_time > 0
+
+
+def test_max_queries_passes_within_budget(app, max_queries):
+    with app.app_context():
+        with max_queries(1):
+            db.session.execute(db.select(Role)).all()
+
+
+def test_max_queries_lists_statements_over_budget(app, max_queries):
+    with app.app_context():
+        with pytest.raises(AssertionError, match="Expected at most 1 queries, 2 were executed"):
+            with max_queries(1):
+                db.session.execute(db.select(Role)).all()
+                db.session.execute(db.select(Role.name)).all()
+
+
+def test_stats_headers_follow_config(app, client):
+    app.config["SQL_STATS_HEADERS"] = False
+    assert "X-DB-Queries" not in client.get("/users/get-all-user").headers
+
+    app.config["SQL_STATS_HEADERS"] = True
+    try:
+        response = client.get("/users/get-all-user")
+    finally:
+        app.config["SQL_STATS_HEADERS"] = False
+    assert int(response.headers["X-DB-Queries"]) >= 1
+    assert response.headers["X-DB-Time"].endswith("ms")
@@ -0,0 +1,94 @@
+import time
+import uuid
+import pytest
+from flask import Flask, jsonify
+from extentions import db
+from app.cache import TTLCache
+from app.database.models import Role
+from app.database.replica import replica_router, use_read_replica
+
+REPLICAS = ["replica_0", "replica_1"]
+
+
+@pytest.fixture
+def routed_app(tmp_path, monkeypatch):
+    """
+    An app on a primary and two replica SQLite files, each holding a single
+    role named after its database, so a read shows where it was served.
+    """
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'primary.db'}",
+        SQLALCHEMY_BINDS={key: f"sqlite:///{tmp_path / key}.db" for key in REPLICAS},
+    )
+    # init_app registers a metadata per bind on the shared db; keep the
+    # session app's drop_all away from these binds
+    monkeypatch.setattr(db, "metadatas", dict(db.metadatas))
+    db.init_app(app)
+    monkeypatch.setattr(replica_router, "bind_keys", list(REPLICAS))
+    monkeypatch.setattr(replica_router, "selection", "round_robin")
+    monkeypatch.setattr(replica_router, "sticky_seconds", 5)
+    monkeypatch.setattr(replica_router, "sticky", TTLCache(maxsize=100, ttl=5))
+    app.after_request(replica_router._remember_writes)
+
+    @app.get("/roles")
+    @use_read_replica
+    def read_roles():
+        return jsonify(sorted(role.name for role in Role.query.all()))
+
+    @app.post("/roles/<name>")
+    @use_read_replica
+    def write_role(name):
+        db.session.add(Role(name=name))
+        db.session.commit()
+        return jsonify(sorted(role.name for role in Role.query.all()))
+
+    with app.app_context():
+        for key, engine in db.engines.items():
+            Role.__table__.create(engine)
+            with engine.begin() as connection:
+                connection.execute(Role.__table__.insert(), {"role_id": uuid.uuid4(), "name": key or "primary"})
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_reads_go_to_the_replicas(routed_app):
+    client = routed_app.test_client()
+    served = [client.get("/roles").get_json() for _ in range(4)]
+    assert sorted(map(tuple, served)) == [("replica_0",), ("replica_0",), ("replica_1",), ("replica_1",)]
+
+
+def test_reads_after_a_write_stay_on_the_primary(routed_app):
+    client = routed_app.test_client()
+    # the write's own reads use the primary
+    assert client.post("/roles/editor").get_json() == ["editor", "primary"]
+    assert client.get_cookie("db_sticky") is not None
+
+    assert client.get("/roles").get_json() == ["editor", "primary"]
+    # the same client without the cookie is still known by its address
+    client.delete_cookie("db_sticky")
+    assert client.get("/roles").get_json() == ["editor", "primary"]
+
+
+def test_sticky_window_expires(routed_app, monkeypatch):
+    monkeypatch.setattr(replica_router, "sticky", TTLCache(maxsize=100, ttl=0.2))
+    client = routed_app.test_client()
+    client.post("/roles/editor")
+    client.delete_cookie("db_sticky")
+    assert client.get("/roles").get_json() == ["editor", "primary"]
+
+    time.sleep(0.3)
+    assert client.get("/roles").get_json() in (["replica_0"], ["replica_1"])
+
+
+def test_least_connections_picks_the_idle_replica(routed_app, monkeypatch):
+    monkeypatch.setattr(replica_router, "selection", "least_connections")
+    client = routed_app.test_client()
+    with routed_app.app_context():
+        busy = db.engines["replica_0"].connect()
+    try:
+        assert [client.get("/roles").get_json() for _ in range(3)] == [["replica_1"]] * 3
+    finally:
+        busy.close()
@@ -0,0 +1,134 @@
+import pytest
+from extentions import db, response_cache
+from app.database.models import Role
+from app.response_cache import CachedResponse, MemoryBackend, RedisBackend
+
+
+def role_names(result):
+    return sorted(role["name"] for role in result.get_json()["data"])
+
+
+def test_write_then_gets_serve_the_new_body(app, client):
+    with app.app_context():
+        db.session.add(Role(name="editor"))
+        db.session.commit()
+    assert client.get("/roles/get-roles").headers["X-Cache"] == "MISS"
+    assert client.get("/roles/get-roles").headers["X-Cache"] == "HIT"
+
+    # a write whose invalidation never reached this cache, e.g. another process
+    with app.app_context():
+        db.session.add(Role(name="reviewer"))
+        db.session.commit()
+
+    first = client.get("/roles/get-roles")
+    second = client.get("/roles/get-roles")
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert role_names(first) == role_names(second) == ["editor", "reviewer"]
+    assert first.headers["ETag"] == second.headers["ETag"]
+
+
+def test_hit_carries_its_validators(client):
+    first = client.get("/roles/get-roles")
+    second = client.get("/roles/get-roles")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.get_data() == first.get_data()
+
+
+def cached_entries():
+    return len(response_cache.backend.cache)
+
+
+def assert_write_invalidates(client, path, write, headers=None):
+    assert client.get(path, headers=headers).headers["X-Cache"] == "MISS"
+    assert client.get(path, headers=headers).headers["X-Cache"] == "HIT"
+    assert cached_entries() == 1
+
+    assert write().status_code == 201
+    assert cached_entries() == 0
+    assert client.get(path, headers=headers).headers["X-Cache"] == "MISS"
+
+
+def test_create_role_invalidates_roles(client):
+    assert_write_invalidates(client, "/roles/get-roles", lambda: client.post(
+        "/roles/create-role", json={"name": "editor", "description": "Edits recipes"}))
+
+
+def test_create_permission_invalidates_permissions(client):
+    assert_write_invalidates(client, "/permissions/get-permissions", lambda: client.post(
+        "/permissions/create-permission", json={"name": "create_recipe", "description": "Adds recipes"}))
+
+
+def test_create_recipe_invalidates_author_recipes(client, make_user, make_category):
+    _, headers = make_user()
+    recipe = {"title": "Soup", "content": "Boil water.", "category_id": make_category()}
+    assert_write_invalidates(client, "/recipe/user", lambda: client.post(
+        "/recipe/add-recipe", json=recipe, headers=headers), headers)
+
+
+def test_create_categories_invalidates_recipe_listings(client, make_user, grant):
+    user_id, headers = make_user()
+    grant(user_id, "create_category")
+    assert_write_invalidates(client, "/recipe/user", lambda: client.post(
+        "/recipe/add-category", json={"categories": ["Stews"]}, headers=headers), headers)
+
+
+def test_memory_backend_counters():
+    backend = MemoryBackend(maxsize=2, ttl=30)
+    for key in ("a", "b", "c"):
+        backend.set(key, CachedResponse(200, "application/json", b"{}"), 30, ["t"])
+
+    assert backend.get("a") is None
+    assert backend.get("c").body == b"{}"
+    stats = backend.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 1, 1, 2)
+
+
+@pytest.fixture
+def redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeStrictRedis()
+    client.flushall()
+    return RedisBackend(client, prefix="test-cache:")
+
+
+def entry():
+    return CachedResponse(200, "application/json", b'{"ok": true}')
+
+
+def test_redis_set_and_get(redis_backend):
+    redis_backend.set("roles|*|", entry(), 30, ["roles"])
+    cached = redis_backend.get("roles|*|")
+    assert (cached.status, cached.mimetype, cached.body) == (200, "application/json", b'{"ok": true}')
+    assert redis_backend.get("missing") is None
+    stats = redis_backend.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_redis_invalidate_drops_tagged_keys(redis_backend):
+    redis_backend.set("a", entry(), 30, ["roles"])
+    redis_backend.set("b", entry(), 30, ["roles", "permissions"])
+    redis_backend.set("c", entry(), 30, ["permissions"])
+
+    assert redis_backend.invalidate(["roles"]) == 2
+    assert redis_backend.get("a") is None and redis_backend.get("b") is None
+    assert redis_backend.get("c") is not None
+    assert not redis_backend.client.exists("test-cache:tag:roles")
+
+
+def test_redis_clear_keeps_other_prefixes(redis_backend):
+    redis_backend.client.set("other", b"1")
+    redis_backend.set("a", entry(), 30, ["roles"])
+    redis_backend.clear()
+    assert redis_backend.client.keys("test-cache:*") == []
+    assert redis_backend.client.get("other") == b"1"
+
+
+def test_redis_tag_outlives_its_longest_entry(redis_backend):
+    redis_backend.set("long", entry(), 300, ["roles"])
+    redis_backend.set("short", entry(), 5, ["roles"])
+    assert redis_backend.client.ttl("test-cache:tag:roles") > 5
+
+    redis_backend.set("longer", entry(), 600, ["roles"])
+    assert redis_backend.client.ttl("test-cache:tag:roles") > 300
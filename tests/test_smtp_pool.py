@@ -0,0 +1,84 @@
+import smtplib
+from app.smtp_pool import SMTPConnectionPool, PooledConnection
+
+
+class FakeHost:
+    def __init__(self):
+        self.closed = False
+
+    def noop(self):
+        return (250, b"OK")
+
+    def quit(self):
+        self.closed = True
+
+    close = quit
+
+
+class FakeConnection:
+    """
+    Flask-Mail connection stand-in; `outcomes` maps a message to the
+    exception its send raises.
+    """
+
+    def __init__(self, outcomes):
+        self.host = FakeHost()
+        self.outcomes = outcomes
+
+    def send(self, message):
+        error = self.outcomes.get(message)
+        if error is not None:
+            raise error
+
+
+def make_pool(outcomes):
+    pool = SMTPConnectionPool(size=1, max_messages=100, idle_timeout=60, health_check_interval=60)
+    connections = []
+
+    def open_connection():
+        connection = FakeConnection(outcomes)
+        connections.append(connection)
+        pool.handshakes += 1
+        return PooledConnection(connection)
+
+    pool._open = open_connection
+    return pool, connections
+
+
+def test_refused_recipient_keeps_the_session():
+    refused = smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"No such user")})
+    pool, connections = make_pool({"b": refused})
+
+    results = pool.send_batch(["a", "b", "c"])
+
+    assert results == [None, refused, None]
+    assert pool.handshakes == 1
+    assert pool.failures == 1
+    assert not connections[0].host.closed
+
+
+def test_disconnect_reopens_for_the_rest_of_the_batch():
+    dropped = smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+    pool, connections = make_pool({"b": dropped})
+
+    results = pool.send_batch(["a", "b", "c"])
+
+    assert results == [None, dropped, None]
+    assert pool.handshakes == 2
+    assert connections[0].host.closed
+
+
+def test_send_reuses_the_session_after_a_rejected_message():
+    rejected = smtplib.SMTPDataError(554, b"Message rejected")
+    pool, _ = make_pool({"b": rejected})
+
+    pool.send("a")
+    try:
+        pool.send("b")
+    except smtplib.SMTPDataError:
+        pass
+    pool.send("c")
+
+    assert pool.handshakes == 1
+    assert pool.messages_sent == 2
+    assert pool.failures == 1